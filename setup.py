@@ -44,9 +44,11 @@ setup(
     # Optional dependencies for 3D visualization
     extras_require={
         'visualization': ['matplotlib>=3.3.0', 'numpy>=1.19.0'],
+        'performance': ['numpy>=1.19.0', 'numba>=0.57.0'],
         'dev': [
             'pytest>=7.0.0',
             'pytest-cov>=3.0.0',
+            'pytest-xdist>=2.5.0',
             'black>=22.0.0',
             'pylint>=2.12.0',
             'flake8>=4.0.0',
@@ -5,6 +5,9 @@ Calculates primary optical aberrations for single lens elements
 """
 
 import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from typing import Optional, Dict, Any, List, Tuple
 
 # Import ray tracer for exact calculations
@@ -67,20 +70,76 @@ class AberrationsCalculator:
         """
         self.target = target
         # Check if target is an OpticalSystem (has elements)
-        if hasattr(target, 'elements'):
-            self.is_system = True
+        self.is_system = hasattr(target, 'elements')
+        if not self.is_system:
+            self.lens = target
+        self.invalidate()
+    
+    def invalidate(self) -> None:
+        """
+        Re-read the target's parameters and drop cached results.
+        
+        calculate_all_aberrations detects in-place changes to the target by
+        itself; call this after changes it cannot see (e.g. material data).
+        """
+        target = self.target
+        if self.is_system:
             # For system calculations, use effective properties
             self.n = 1.0 # System in air
             self.D = target.elements[0].lens.diameter if target.elements else 25.0
-            # focal_length = target.get_system_focal_length()
         else:
-            self.is_system = False
-            self.lens = target
             self.n = target.refractive_index
             self.R1 = target.radius_of_curvature_1
             self.R2 = target.radius_of_curvature_2
             self.d = target.thickness
             self.D = target.diameter
+        self._state = self._state_key()
+        self._base: Optional[Dict[str, Any]] = None
+    
+    def _state_key(self) -> Tuple:
+        """Snapshot of the target parameters the cached results depend on"""
+        if self.is_system:
+            return (tuple((e.position, e.lens.refractive_index, e.lens.radius_of_curvature_1,
+                           e.lens.radius_of_curvature_2, e.lens.thickness, e.lens.diameter)
+                          for e in self.target.elements),
+                    tuple(gap.thickness for gap in self.target.air_gaps))
+        lens = self.target
+        return (lens.refractive_index, lens.radius_of_curvature_1, lens.radius_of_curvature_2,
+                lens.thickness, lens.diameter, lens.material)
+    
+    def _field_independent(self) -> Dict[str, Any]:
+        """Aberrations that do not depend on the field angle, cached per target state"""
+        if self._state_key() != self._state:
+            self.invalidate()
+        if self._base is not None:
+            return self._base
+        
+        if self.is_system:
+            focal_length = self.target.get_system_focal_length()
+        else:
+            focal_length = self.lens.calculate_focal_length()
+        
+        if focal_length is None:
+            base = {'focal_length': None}
+        else:
+            chromatic = self._calculate_chromatic_aberration(focal_length)
+            spherical = self._calculate_spherical_aberration(focal_length)
+            base = {
+                'focal_length': focal_length,
+                'numerical_aperture': self._calculate_numerical_aperture(focal_length),
+                'f_number': self._calculate_f_number(focal_length),
+                'spherical': spherical,
+                'spherical_aberration': spherical,
+                'chromatic': chromatic,
+                'chromatic_aberration': chromatic,
+                'airy_disk_diameter': self._calculate_airy_disk(focal_length),
+                'strehl': self._calculate_strehl_ratio(focal_length),
+                'mtf_cutoff': self._calculate_mtf_cutoff(focal_length),
+            }
+            if self.is_system:
+                base['spot_rms'] = self._calculate_spot_rms()
+        self._base = base
+        return base
         
     def calculate_all_aberrations(self, 
                                    object_distance_mm: Optional[float] = None,
@@ -104,10 +163,8 @@ class AberrationsCalculator:
         
         # Note: Current simplified model uses primary wavelength for Seidel aberrations
         # Future enhancement: Update refractive indices based on wavelength parameter
-        if self.is_system:
-            focal_length = self.target.get_system_focal_length()
-        else:
-            focal_length = self.lens.calculate_focal_length()
+        base = self._field_independent()
+        focal_length = base['focal_length']
         
         if focal_length is None:
             return {
@@ -128,46 +185,16 @@ class AberrationsCalculator:
                 'error': 'Cannot calculate focal length (zero optical power)'
             }
         
-        # Calculate numerical aperture and other parameters
-        na = self._calculate_numerical_aperture(focal_length)
-        
+        results = dict(base)
         if self.is_system:
             # For systems, we primarily rely on exact calculations where possible
-            field_data = self._calculate_field_metrics_system(field_angle_deg)
-            return {
-                'focal_length': focal_length,
-                'numerical_aperture': na,
-                'f_number': self._calculate_f_number(focal_length),
-                'spherical': self._calculate_spherical_aberration(focal_length),
-                'spherical_aberration': self._calculate_spherical_aberration(focal_length),
-                'coma': field_data['coma'],
-                'astigmatism': field_data['astigmatism'],
-                'field_curvature': field_data['field_curvature'],
-                'distortion': field_data['distortion'],
-                'chromatic': self._calculate_chromatic_aberration(focal_length),
-                'chromatic_aberration': self._calculate_chromatic_aberration(focal_length),
-                'airy_disk_diameter': self._calculate_airy_disk(focal_length),
-                'spot_rms': self._calculate_spot_rms() if self.is_system else 0,
-                'strehl': self._calculate_strehl_ratio(focal_length),
-                'mtf_cutoff': self._calculate_mtf_cutoff(focal_length)
-            }
-
-        return {
-            'focal_length': focal_length,
-            'numerical_aperture': na,
-            'f_number': self._calculate_f_number(focal_length),
-            'spherical': self._calculate_spherical_aberration(focal_length),
-            'spherical_aberration': self._calculate_spherical_aberration(focal_length),
-            'coma': self._calculate_coma(focal_length, field_angle_deg),
-            'astigmatism': self._calculate_astigmatism(focal_length, field_angle_deg),
-            'field_curvature': self._calculate_field_curvature(focal_length),
-            'distortion': self._calculate_distortion(focal_length, field_angle_deg),
-            'chromatic': self._calculate_chromatic_aberration(focal_length),
-            'chromatic_aberration': self._calculate_chromatic_aberration(focal_length),
-            'airy_disk_diameter': self._calculate_airy_disk(focal_length),
-            'strehl': self._calculate_strehl_ratio(focal_length),
-            'mtf_cutoff': self._calculate_mtf_cutoff(focal_length)
-        }
+            results.update(self._calculate_field_metrics_system(field_angle_deg))
+        else:
+            results['coma'] = self._calculate_coma(focal_length, field_angle_deg)
+            results['astigmatism'] = self._calculate_astigmatism(focal_length, field_angle_deg)
+            results['field_curvature'] = self._calculate_field_curvature(focal_length)
+            results['distortion'] = self._calculate_distortion(focal_length, field_angle_deg)
+        return results
     
     def _calculate_f_number(self, focal_length: float) -> float:
         """Calculate the f-number (f/D)"""
@@ -696,3 +723,32 @@ def analyze_lens_quality(lens: Any, field_angle: float = 5.0, **kwargs) -> Dict[
         'issues': issues if issues else ["No significant aberrations detected"],
         'aberrations': results
     }
+
+
+def analyze_lens_quality_batch(lenses: List[Any], field_angle: float = 5.0,
+                               workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Analyze the quality of many independent lenses in parallel.
+    
+    Each lens is analyzed with analyze_lens_quality in a worker process.
+    
+    Args:
+        lenses: List of (picklable) Lens objects
+        field_angle: Field angle for off-axis aberrations (degrees)
+        workers: Number of worker processes (default: CPU count)
+        
+    Returns:
+        List of quality assessments, in the same order as lenses
+    """
+    if not lenses:
+        return []
+    
+    workers = workers or os.cpu_count() or 1
+    analyze = partial(analyze_lens_quality, field_angle=field_angle)
+    
+    if workers == 1:
+        return [analyze(lens) for lens in lenses]
+    
+    chunksize = max(1, len(lenses) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(analyze, lenses, chunksize=chunksize))
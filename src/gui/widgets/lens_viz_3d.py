@@ -15,9 +15,9 @@ class _3DVisualizationWidget(QWidget):
         self.setStyleSheet("background-color: #1e1e1e;")
         
         try:
-            import matplotlib
-            matplotlib.use('Qt5Agg')
-            from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+            # Embed the canvas directly; pyplot's global backend is left alone
+            # so headless runs and scripts keep the non-interactive default
+            from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg
             from matplotlib.figure import Figure
             
             self._figure = Figure(figsize=(6, 5), facecolor='#1e1e1e')
@@ -95,7 +95,7 @@ class _3DVisualizationWidget(QWidget):
         
         # Helper for sag
         def get_sag(r, y):
-            if abs(r) < 1e-6: return 0
+            if abs(r) < 1e-6 or not np.isfinite(r): return 0  # Flat surface
             r_a = abs(r)
             y_safe = np.minimum(y, r_a)
             sag = r_a - np.sqrt(np.maximum(0, r_a**2 - y_safe**2))
@@ -135,14 +135,14 @@ class _3DVisualizationWidget(QWidget):
         R, THETA = np.meshgrid(r_vals, theta_vals)
 
         # Front surface (blue)
-        if r1_abs > 0.1:
+        if 0.1 < r1_abs < np.inf:
             Z_front = x1_vertex + get_sag(r1, R)
             X = R * np.cos(THETA)
             Y = R * np.sin(THETA)
             self._ax.plot_surface(X, Y, Z_front, alpha=0.5, color='blue', rstride=2, cstride=2)
 
         # Back surface (green)
-        if r2_abs > 0.1:
+        if 0.1 < r2_abs < np.inf:
             Z_back = x2_vertex + get_sag(r2, R)
             X = R * np.cos(THETA)
             Y = R * np.sin(THETA)
@@ -164,4 +164,6 @@ class _3DVisualizationWidget(QWidget):
         self._ax.text2D(0.02, 0.98, dim_text, transform=self._ax.transAxes,
                        color='white', fontsize=10, fontweight='bold')
         
-        self._canvas.draw()
+        # Render on the next event loop pass; updates arriving in one pass
+        # (e.g. while a parameter is being edited) share a single render
+        self._canvas.draw_idle()
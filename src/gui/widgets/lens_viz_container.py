@@ -11,6 +11,7 @@ class LensVisualizationWidget(QWidget):
         self._lens = None
         self._view_mode = "2D"
         self._rotation = 0
+        self._3d_stale = False
         
         self.setMinimumSize(400, 300)
         self.setStyleSheet("background-color: #1e1e1e;")
@@ -30,6 +31,7 @@ class LensVisualizationWidget(QWidget):
         # 3D view (matplotlib embedded)
         self._3d_widget = _3DVisualizationWidget()
         self._viz_tabs.addTab(self._3d_widget, "3D")
+        self._viz_tabs.currentChanged.connect(self._on_tab_changed)
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -48,4 +50,15 @@ class LensVisualizationWidget(QWidget):
         """Update visualization with new lens data"""
         self._lens = lens
         self._2d_widget.update_lens(lens)
-        self._3d_widget.update_lens(lens)
+        # Rebuilding the 3D surfaces is far costlier than the 2D repaint, so
+        # while the 3D tab is hidden it is only rebuilt once it is shown
+        if self._viz_tabs.currentWidget() is self._3d_widget:
+            self._3d_widget.update_lens(lens)
+        else:
+            self._3d_stale = True
+    
+    def _on_tab_changed(self, index):
+        """Bring the 3D view up to date when its tab is shown"""
+        if self._3d_stale and self._viz_tabs.widget(index) is self._3d_widget:
+            self._3d_stale = False
+            self._3d_widget.update_lens(self._lens)
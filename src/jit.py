@@ -0,0 +1,26 @@
+"""
+Optional Numba JIT support for openlens
+
+Numba is an optional dependency. When it is installed, ``njit`` and
+``prange`` are the real Numba objects; otherwise ``njit`` is a no-op
+decorator and ``prange`` is ``range`` so kernels still run as plain Python.
+"""
+
+from typing import Any, Callable
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args: Any, **kwargs: Any) -> Callable:
+        """No-op stand-in for numba.njit (supports bare and called forms)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func: Callable) -> Callable:
+            return func
+        return decorator
+
+    prange = range
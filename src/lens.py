@@ -18,6 +18,12 @@ except ImportError:
     EPSILON = 1e-10
     LARGE_NUMBER = 1e10
 
+# NumPy is optional; only needed for the batch entry points
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Try to import material database (optional)
 get_material_database = None
 MATERIAL_DB_AVAILABLE = False
@@ -34,12 +40,39 @@ except (ImportError, ValueError):
         MATERIAL_DB_AVAILABLE = False
 
 
+def _focal_length_kernel(kind: int, n: float, R1: float, R2: float, d: float) -> float:
+    """
+    Optical power from the lensmaker's equation, specialized by surface kind.
+    
+    1/f = (n-1)[1/R1 - 1/R2 + (n-1)d/(nR1R2)]; the thickness term vanishes
+    when either surface is flat, so plano lenses skip the 1/inf divisions.
+    """
+    nm1 = n - 1.0
+    if kind == 0:
+        inv_r1 = 1.0 / R1
+        inv_r2 = 1.0 / R2
+        return nm1 * (inv_r1 - inv_r2 + nm1 * d * inv_r1 * inv_r2 / n)
+    elif kind == 1:
+        return -nm1 / R2
+    elif kind == 2:
+        return nm1 / R1
+    return 0.0
+
+
 class Lens:
     """
     Represents an optical lens with its physical and optical properties.
     Shared model between CLI and GUI.
     """
     
+    __slots__ = (
+        'id', 'name', '_radius_of_curvature_1', '_radius_of_curvature_2', '_kind',
+        'thickness', 'diameter', 'material', 'wavelength', 'temperature',
+        'model_glass_mode', 'model_nd', 'model_vd', 'refractive_index', 'lens_type',
+        'is_fresnel', 'groove_pitch', 'num_grooves', 'created_at', 'modified_at',
+        '_fl_key', '_fl_cache',
+    )
+    
     def __init__(self, 
                  name: str = "Untitled",
                  radius_of_curvature_1: float = DEFAULT_RADIUS_1,
@@ -60,6 +93,8 @@ class Lens:
                  model_vd: float = 64.17) -> None:
         
         self.id = uuid.uuid4().hex
+        self._fl_key = None  # Inputs of the last calculate_focal_length call
+        self._fl_cache = None
         self.name = name
         self.radius_of_curvature_1 = radius_of_curvature_1
         self.radius_of_curvature_2 = radius_of_curvature_2
@@ -120,6 +155,13 @@ class Lens:
         if self.is_fresnel and self.num_grooves is None:
             self.calculate_num_grooves()
     
+    def __copy__(self) -> 'Lens':
+        """Copy every slot directly instead of re-running __init__ (all values are immutable)"""
+        new = object.__new__(type(self))
+        for attr in Lens.__slots__:
+            object.__setattr__(new, attr, getattr(self, attr))
+        return new
+    
     @property
     def radius_of_curvature_1(self) -> float:
         return self._radius_of_curvature_1
@@ -130,6 +172,7 @@ class Lens:
             self._radius_of_curvature_1 = float('inf')
         else:
             self._radius_of_curvature_1 = value
+        self._update_kind()
     
     @property
     def radius_of_curvature_2(self) -> float:
@@ -141,6 +184,19 @@ class Lens:
             self._radius_of_curvature_2 = float('inf')
         else:
             self._radius_of_curvature_2 = value
+        self._update_kind()
+    
+    @property
+    def flat_surfaces(self) -> int:
+        """Flat surfaces as a bitmask: bit 0 is the first surface, bit 1 the second"""
+        return self._kind
+    
+    def _update_kind(self) -> None:
+        """Classify the surfaces once so the focal length kernel can skip 1/inf terms"""
+        flat_1 = math.isinf(getattr(self, '_radius_of_curvature_1', 0.0))
+        flat_2 = math.isinf(getattr(self, '_radius_of_curvature_2', 0.0))
+        # 0: both curved, 1: plano first surface, 2: plano second surface, 3: both flat
+        self._kind = int(flat_1) | (int(flat_2) << 1)
     
     def update_refractive_index(self, 
                                  wavelength_nm: Optional[float] = None,
@@ -244,24 +300,61 @@ class Lens:
         Calculate focal length using the lensmaker's equation.
         """
         n = self.refractive_index
-        R1 = self.radius_of_curvature_1
-        R2 = self.radius_of_curvature_2
+        R1 = self._radius_of_curvature_1
+        R2 = self._radius_of_curvature_2
         d = self.thickness
         
+        # Memoized on the inputs, so any change to the lens is picked up.
+        # Only the last result is kept per lens: a shared lru_cache lookup
+        # costs more than the lensmaker's kernel it would skip
+        key = (n, R1, R2, d)
+        if key == self._fl_key:
+            return self._fl_cache
+        
         # Use EPSILON for zero check to handle floating-point edge cases
         if abs(R1) < EPSILON or abs(R2) < EPSILON:
-            return None
+            f = None
+        else:
+            try:
+                power = _focal_length_kernel(self._kind, n, R1, R2, d)
+                f = None if abs(power) < EPSILON else 1 / power
+            except ZeroDivisionError:
+                f = None
+        
+        self._fl_key = key
+        self._fl_cache = f
+        return f
+    
+    @staticmethod
+    def calculate_focal_length_batch(r1: Any, r2: Any, t: Any, n: Any) -> Any:
+        """
+        Vectorized lensmaker's equation for parameter sweeps.
         
-        # Lensmaker's equation: 1/f = (n-1)[1/R1 - 1/R2 + (n-1)d/(nR1R2)]
-        try:
-            power = (n - 1) * ((1/R1) - (1/R2) + ((n - 1) * d) / (n * R1 * R2))
-            
-            if abs(power) < EPSILON:
-                return None
-            
-            return 1 / power
-        except ZeroDivisionError:
-            return None
+        Args:
+            r1, r2: Arrays of surface radii (mm); 0 or inf means flat
+            t: Array of center thicknesses (mm)
+            n: Array of refractive indices
+        
+        Returns:
+            Array of focal lengths (mm), NaN where the lens has no optical
+            power (where calculate_focal_length would return None)
+        """
+        if np is None:
+            raise ImportError("calculate_focal_length_batch requires numpy")
+        
+        r1 = np.asarray(r1, dtype=np.float64)
+        r2 = np.asarray(r2, dtype=np.float64)
+        t = np.asarray(t, dtype=np.float64)
+        n = np.asarray(n, dtype=np.float64)
+        
+        nm1 = n - 1.0
+        # 1/inf is already 0; map 0 to flat as the radius setters do
+        inv_r1 = np.divide(1.0, r1, out=np.zeros(r1.shape), where=r1 != 0)
+        inv_r2 = np.divide(1.0, r2, out=np.zeros(r2.shape), where=r2 != 0)
+        power = nm1 * (inv_r1 - inv_r2 + nm1 * t * inv_r1 * inv_r2 / n)
+        
+        with np.errstate(divide='ignore'):
+            return np.where(np.abs(power) < EPSILON, np.nan, 1.0 / power)
     
     def _update_radii_for_type(self) -> None:
         """Update radii based on the current lens_type."""
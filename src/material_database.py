@@ -370,10 +370,6 @@ class MaterialDatabase:
         Import materials from AGF catalog file.
         Returns number of materials imported.
         """
-        if not os.path.exists(catalog_file):
-            logger.error(f"Catalog file not found: {catalog_file}")
-            return 0
-            
         count = 0
         current_glass: Optional[Dict] = None
         catalog_name = "AGF_Import"
@@ -460,6 +456,8 @@ class MaterialDatabase:
                 self._process_agf_glass(current_glass, catalog_name)
                 count += 1
                 
+        except FileNotFoundError:
+            logger.error(f"Catalog file not found: {catalog_file}")
         except Exception as e:
             logger.error(f"Error importing AGF catalog: {e}")
             
@@ -502,9 +500,6 @@ class MaterialDatabase:
         Import materials from CSV file.
         Expected headers: Name,Catalog,Nd,Vd,B1,B2,B3,C1,C2,C3,...
         """
-        if not os.path.exists(catalog_file):
-            return 0
-            
         count = 0
         try:
             with open(catalog_file, 'r', newline='') as f:
@@ -536,6 +531,8 @@ class MaterialDatabase:
                     except (ValueError, KeyError) as e:
                         logger.warning(f"Skipping invalid CSV row: {e}")
                         continue
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.error(f"Error importing CSV catalog: {e}")
             
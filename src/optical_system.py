@@ -6,7 +6,6 @@ Supports compound lenses, doublets, triplets with air gaps
 
 from typing import List, Tuple, Optional, Dict, Any
 from dataclasses import dataclass, field
-import math
 import json
 import uuid
 from datetime import datetime
@@ -411,40 +410,44 @@ class OpticalSystem:
         through the glass at the reduced thickness d/n, refraction at the
         second surface, then propagation through the following air gap.
         """
-        if not self.elements:
+        elements = self.elements
+        if not elements:
             return None
+        air_gaps = self.air_gaps
+        n_gaps = min(len(elements) - 1, len(air_gaps))
 
         # Ray vector [y, u]; M = [[A, B], [C, D]], start at identity.
+        # Matrices are applied by updating only the row they change, in
+        # place; this is the inner loop of every paraxial quantity.
         A, B, C, D = 1.0, 0.0, 0.0, 1.0
-        n_current = 1.0  # start in air
 
-        for i, element in enumerate(self.elements):
+        for i, element in enumerate(elements):
             lens = element.lens
             n_lens = lens.refractive_index
+            kind = lens.flat_surfaces  # bit 0: first surface, bit 1: second surface
 
-            # Refraction at first surface (n_current → n_lens).
-            # Standard paraxial refraction matrix is [[1, 0], [-P, 1]].
-            R1 = lens.radius_of_curvature_1
-            if R1 != 0 and math.isfinite(R1):
-                P1 = (n_lens - n_current) / R1
-                A, B, C, D = (A, B, C - P1 * A, D - P1 * B)
+            # Refraction at first surface (air → n_lens), [[1, 0], [-P, 1]].
+            if not kind & 1:
+                P = (n_lens - 1.0) / lens.radius_of_curvature_1
+                C -= P * A
+                D -= P * B
 
             # Propagation inside the glass: reduced thickness d/n.
             d = lens.thickness / n_lens if n_lens else lens.thickness
-            A, B, C, D = (A + d * C, B + d * D, C, D)
+            A += d * C
+            B += d * D
 
             # Refraction at second surface (n_lens → air).
-            R2 = lens.radius_of_curvature_2
-            if R2 != 0 and math.isfinite(R2):
-                P2 = (1.0 - n_lens) / R2
-                A, B, C, D = (A, B, C - P2 * A, D - P2 * B)
-
-            n_current = 1.0
+            if not kind & 2:
+                P = (1.0 - n_lens) / lens.radius_of_curvature_2
+                C -= P * A
+                D -= P * B
 
             # Air gap to next element
-            if i < len(self.elements) - 1 and i < len(self.air_gaps):
-                d_gap = self.air_gaps[i].thickness
-                A, B, C, D = (A + d_gap * C, B + d_gap * D, C, D)
+            if i < n_gaps:
+                d_gap = air_gaps[i].thickness
+                A += d_gap * C
+                B += d_gap * D
 
         return A, B, C, D
     
@@ -6,7 +6,8 @@ Automatically optimize lens parameters to minimize aberrations and improve perfo
 
 import math
 import random
-from typing import List, Dict, Tuple, Callable, Optional
+import sys
+from typing import Any, List, Dict, Tuple, Callable, Optional
 from dataclasses import dataclass, field
 import copy
 from concurrent.futures import ProcessPoolExecutor
@@ -18,7 +19,6 @@ try:
     from .analysis import SpotDiagram
     from .analysis.beam_synthesis import PSFCalculator, WavefrontSensor, NUMPY_AVAILABLE
 except (ImportError, ValueError):
-    import sys
     import os
     sys.path.insert(0, os.path.dirname(__file__))
     from lens_editor import Lens
@@ -33,7 +33,21 @@ except (ImportError, ValueError):
         pass
 
 
-@dataclass
+# Lens attributes touched when a variable of each kind is written
+_VARIABLE_STATE_ATTRS = {
+    "radius_of_curvature_1": ("radius_of_curvature_1",),
+    "radius_of_curvature_2": ("radius_of_curvature_2",),
+    "thickness": ("thickness",),
+    "refractive_index": ("model_glass_mode", "model_nd", "refractive_index"),
+    "abbe_number": ("model_glass_mode", "model_vd", "refractive_index"),
+}
+
+
+# Slotted dataclasses need Python 3.10+; older interpreters get regular ones
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class OptimizationVariable:
     """A variable that can be optimized"""
     name: str
@@ -54,7 +68,7 @@ class OptimizationVariable:
         return max(self.min_value, min(self.max_value, value))
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class OptimizationTarget:
     """An optimization target/constraint"""
     name: str
@@ -91,21 +105,12 @@ class MeritFunction:
             'min_edge_clearance': 0.1
         }
     
-    def evaluate(self, system: OpticalSystem) -> float:
+    def constraint_penalty(self, system: OpticalSystem) -> float:
         """
-        Evaluate merit function (lower is better)
-        
-        Merit function combines multiple targets:
-        - Spherical aberration
-        - Chromatic aberration
-        - Coma
-        - Astigmatism
-        - Focal length target
-        - RMS spot size
-        - System Length
-        - MTF
-        
-        Also adds penalties for invalid geometries (edge thickness).
+        Penalty term for physically invalid geometries.
+
+        Covers center/edge thickness of every element and air gap / edge
+        clearance between neighbouring elements. Returns 0.0 for a valid system.
         """
         merit = 0.0
         
@@ -205,6 +210,26 @@ class MeritFunction:
                 if edge_clearance < min_ec: # Min edge clearance
                     merit += 1e5 * (min_ec - edge_clearance)**2
 
+        return merit
+
+    def evaluate(self, system: OpticalSystem) -> float:
+        """
+        Evaluate merit function (lower is better)
+        
+        Merit function combines multiple targets:
+        - Spherical aberration
+        - Chromatic aberration
+        - Coma
+        - Astigmatism
+        - Focal length target
+        - RMS spot size
+        - System Length
+        - MTF
+        
+        Also adds penalties for invalid geometries (edge thickness).
+        """
+        merit = self.constraint_penalty(system)
+
         for target in self.targets:
             if target.name == "spherical_aberration":
                 # Get spherical aberration for first lens
@@ -341,6 +366,14 @@ class LensOptimizer:
         self.targets = targets
         self.merit_function = MeritFunction(system, targets, constraints)
         self._merit_cache = {}
+        # Variable bounds, gathered once so clamping is a single pass
+        self._lo = [var.min_value for var in variables]
+        self._hi = [var.max_value for var in variables]
+        # Optional fast paths for optimizers with a known, fixed shape
+        # (see create_doublet_optimizer). When set they replace the generic
+        # variable loop in _apply_variables and MeritFunction.evaluate.
+        self._apply: Optional[Callable[[OpticalSystem, List[float]], None]] = None
+        self._merit: Optional[Callable[[OpticalSystem], float]] = None
     
     def optimize(self, max_iterations: int = 100, tolerance: float = 1e-6, 
                  callback: Optional[Callable[[int, float, List[float]], None]] = None) -> OptimizationResult:
@@ -374,15 +407,19 @@ class LensOptimizer:
         for i in range(n_vars):
             vertex = current_values.copy()
             vertex[i] += self.variables[i].step_size
-            vertex[i] = self.variables[i].clamp(vertex[i])
-            simplex.append(vertex)
+            simplex.append(self._clamp_all(vertex))
         
         # Evaluate merit for all vertices
         merit_values = [self._evaluate_design(vertex) for vertex in simplex]
         
         initial_merit = merit_values[0]
-        variable_history = [dict(zip([v.name for v in self.variables], current_values))]
-        merit_history = [initial_merit]
+        # History is written into preallocated slots (one per iteration plus
+        # the start point) and trimmed to n_hist at the end
+        value_history = [None] * (max_iterations + 1)
+        merit_history = [0.0] * (max_iterations + 1)
+        value_history[0] = current_values
+        merit_history[0] = initial_merit
+        n_hist = 1
         
         # Simplex algorithm parameters
         alpha = 1.0  # Reflection
@@ -416,7 +453,7 @@ class LensOptimizer:
             worst = simplex[-1]
             reflected = [centroid[j] + alpha * (centroid[j] - worst[j]) 
                         for j in range(n_vars)]
-            reflected = [self.variables[j].clamp(reflected[j]) for j in range(n_vars)]
+            reflected = self._clamp_all(reflected)
             reflected_merit = self._evaluate_design(reflected)
             
             if merit_values[0] <= reflected_merit < merit_values[-2]:
@@ -427,7 +464,7 @@ class LensOptimizer:
                 # Try expansion
                 expanded = [centroid[j] + gamma * (reflected[j] - centroid[j])
                            for j in range(n_vars)]
-                expanded = [self.variables[j].clamp(expanded[j]) for j in range(n_vars)]
+                expanded = self._clamp_all(expanded)
                 expanded_merit = self._evaluate_design(expanded)
                 
                 if expanded_merit < reflected_merit:
@@ -440,7 +477,7 @@ class LensOptimizer:
                 # Contraction
                 contracted = [centroid[j] + rho * (worst[j] - centroid[j])
                              for j in range(n_vars)]
-                contracted = [self.variables[j].clamp(contracted[j]) for j in range(n_vars)]
+                contracted = self._clamp_all(contracted)
                 contracted_merit = self._evaluate_design(contracted)
                 
                 if contracted_merit < merit_values[-1]:
@@ -450,15 +487,14 @@ class LensOptimizer:
                     # Shrink simplex toward best point
                     best = simplex[0]
                     for i in range(1, len(simplex)):
-                        simplex[i] = [best[j] + sigma * (simplex[i][j] - best[j])
-                                     for j in range(n_vars)]
-                        simplex[i] = [self.variables[j].clamp(simplex[i][j]) 
-                                     for j in range(n_vars)]
+                        simplex[i] = self._clamp_all([best[j] + sigma * (simplex[i][j] - best[j])
+                                                      for j in range(n_vars)])
                         merit_values[i] = self._evaluate_design(simplex[i])
             
-            # Record history
-            variable_history.append(dict(zip([v.name for v in self.variables], simplex[0])))
-            merit_history.append(merit_values[0])
+            # Record history (vertices are never modified in place)
+            value_history[n_hist] = simplex[0]
+            merit_history[n_hist] = merit_values[0]
+            n_hist += 1
             
             last_iteration = iteration
         
@@ -478,8 +514,8 @@ class LensOptimizer:
             final_merit=final_merit,
             improvement=improvement,
             optimized_system=optimized_system,
-            variable_history=variable_history,
-            merit_history=merit_history,
+            variable_history=self._variable_history(value_history[:n_hist]),
+            merit_history=merit_history[:n_hist],
             message=f"Converged after {last_iteration + 1} iterations"
         )
     
@@ -492,8 +528,11 @@ class LensOptimizer:
         current_values = [var.current_value for var in self.variables]
         initial_merit = self._evaluate_design(current_values)
         
-        variable_history = [dict(zip([v.name for v in self.variables], current_values))]
-        merit_history = [initial_merit]
+        value_history = [None] * (max_iterations + 1)
+        merit_history = [0.0] * (max_iterations + 1)
+        value_history[0] = current_values
+        merit_history[0] = initial_merit
+        n_hist = 1
         
         last_iteration = 0
         
@@ -504,29 +543,27 @@ class LensOptimizer:
             gradient = self._calculate_gradient(current_values)
             
             # Update variables
-            new_values = []
-            for i, (val, grad) in enumerate(zip(current_values, gradient)):
-                new_val = val - learning_rate * grad
-                new_val = self.variables[i].clamp(new_val)
-                new_values.append(new_val)
+            new_values = self._clamp_all([val - learning_rate * grad
+                                          for val, grad in zip(current_values, gradient)])
             
             # Evaluate new design
             new_merit = self._evaluate_design(new_values)
             
             # Check convergence
             improvement = initial_merit - new_merit
-            if abs(new_merit - merit_history[-1]) < tolerance:
+            if abs(new_merit - merit_history[n_hist - 1]) < tolerance:
                 break
             
             # Accept new values
             current_values = new_values
-            variable_history.append(dict(zip([v.name for v in self.variables], current_values)))
-            merit_history.append(new_merit)
+            value_history[n_hist] = current_values
+            merit_history[n_hist] = new_merit
+            n_hist += 1
             
             last_iteration = iteration
         
         optimized_system = self._apply_variables(current_values)
-        final_merit = merit_history[-1]
+        final_merit = merit_history[n_hist - 1]
         improvement = ((initial_merit - final_merit) / initial_merit * 100) if initial_merit > 0 else 0
         
         return OptimizationResult(
@@ -536,11 +573,21 @@ class LensOptimizer:
             final_merit=final_merit,
             improvement=improvement,
             optimized_system=optimized_system,
-            variable_history=variable_history,
-            merit_history=merit_history,
+            variable_history=self._variable_history(value_history[:n_hist]),
+            merit_history=merit_history[:n_hist],
             message=f"Completed {last_iteration + 1} iterations"
         )
     
+    def _variable_history(self, rows: List[List[float]]) -> List[Dict[str, float]]:
+        """Convert recorded value rows into the per-iteration name -> value dicts"""
+        names = [v.name for v in self.variables]
+        return [dict(zip(names, row)) for row in rows]
+    
+    def _clamp_all(self, values: List[float]) -> List[float]:
+        """Clamp every value to its variable bounds in one pass"""
+        return [lo if v < lo else (hi if v > hi else v)
+                for v, lo, hi in zip(values, self._lo, self._hi)]
+
     def _calculate_gradient(self, values: List[float]) -> List[float]:
         """Calculate numerical gradient using finite differences with optional parallelism"""
         epsilon = 1e-5
@@ -551,8 +598,7 @@ class LensOptimizer:
         for i in range(n_vars):
             values_plus = values.copy()
             values_plus[i] += epsilon
-            values_plus[i] = self.variables[i].clamp(values_plus[i])
-            perturbed_designs.append(values_plus)
+            perturbed_designs.append(self._clamp_all(values_plus))
             
         # Evaluate f0 (might already be cached)
         f0 = self._evaluate_design(values)
@@ -575,31 +621,65 @@ class LensOptimizer:
         if cache_key in self._merit_cache:
             return self._merit_cache[cache_key]
             
-        system = self._apply_variables(values)
-        merit = self.merit_function.evaluate(system)
+        # Evaluate in place on self.system and put the original values back
+        # afterwards; deep-copying the whole system per evaluation dominated
+        # the cost of small merit functions.
+        system = self.system
+        state = self._snapshot_variable_state(system)
+        try:
+            self._write_variables(system, values)
+            system._update_positions()
+            if self._merit is not None:
+                merit = self._merit(system)
+            else:
+                merit = self.merit_function.evaluate(system)
+        finally:
+            for obj, attr, value in reversed(state):
+                setattr(obj, attr, value)
+            system._update_positions()
         
         self._merit_cache[cache_key] = merit
         return merit
     
+    def _snapshot_variable_state(self, system: OpticalSystem) -> List[Tuple[Any, str, Any]]:
+        """Record every attribute the variables can write, as (object, attribute, value)"""
+        state = []
+        for var in self.variables:
+            for elem_idx, param in [(var.element_index, var.parameter)] + list(var.linked_targets):
+                if param == "air_gap":
+                    if elem_idx < len(system.air_gaps):
+                        state.append((system.air_gaps[elem_idx], "thickness",
+                                      system.air_gaps[elem_idx].thickness))
+                    continue
+                lens = system.elements[elem_idx].lens
+                for attr in _VARIABLE_STATE_ATTRS.get(param, ()):
+                    state.append((lens, attr, getattr(lens, attr)))
+        return state
+    
     def _apply_variables(self, values: List[float]) -> OpticalSystem:
         """Create a system with variables applied"""
         # Deep copy the system
         system = copy.deepcopy(self.system)
-        
-        # Apply variable values
-        for var, value in zip(self.variables, values):
-            # Apply to primary target
-            self._apply_single_variable(system, var.element_index, var.parameter, value)
-            
-            # Apply to linked targets
-            for elem_idx, param in var.linked_targets:
-                self._apply_single_variable(system, elem_idx, param, value)
+        self._write_variables(system, values)
         
         # Update positions after changes
         system._update_positions()
         
         return system
 
+    def _write_variables(self, system: OpticalSystem, values: List[float]) -> None:
+        """Write variable values into system in place"""
+        if self._apply is not None:
+            self._apply(system, values)
+        else:
+            for var, value in zip(self.variables, values):
+                # Apply to primary target
+                self._apply_single_variable(system, var.element_index, var.parameter, value)
+                
+                # Apply to linked targets
+                for elem_idx, param in var.linked_targets:
+                    self._apply_single_variable(system, elem_idx, param, value)
+
     def _apply_single_variable(self, system: OpticalSystem, element_index: int, parameter: str, value: float):
         """Apply a single variable value to the system"""
         if parameter == "radius_of_curvature_1":
@@ -623,6 +703,43 @@ class LensOptimizer:
             lens.update_refractive_index()
 
 
+def _apply_vars_doublet(system: OpticalSystem, values: List[float]) -> None:
+    """
+    Write doublet variables straight into the radii.
+    Mirrors the variable layout built by create_doublet_optimizer:
+    [R1 crown, cemented interface (crown R2 == flint R1), R2 flint].
+    """
+    crown = system.elements[0].lens
+    flint = system.elements[1].lens
+    crown.radius_of_curvature_1 = values[0]
+    crown.radius_of_curvature_2 = values[1]
+    flint.radius_of_curvature_1 = values[1]
+    flint.radius_of_curvature_2 = values[2]
+
+
+def _make_merit_doublet(merit_function: MeritFunction, chromatic_weight: float,
+                        focal_weight: float, target_focal_length: float
+                        ) -> Callable[[OpticalSystem], float]:
+    """
+    Build a merit function specialized for the doublet targets.
+    Equivalent to MeritFunction.evaluate for a minimized chromatic_aberration
+    target plus a focal_length target, without the generic target dispatch.
+    """
+    penalty = merit_function.constraint_penalty
+
+    def _merit_doublet(system: OpticalSystem) -> float:
+        merit = penalty(system)
+        merit += chromatic_weight * system.calculate_chromatic_aberration()['longitudinal']
+        f = system.get_system_focal_length()
+        if f:
+            merit += focal_weight * (f - target_focal_length)**2
+        else:
+            merit += 1e6  # Penalty for invalid focal length
+        return merit
+
+    return _merit_doublet
+
+
 def create_doublet_optimizer(system: OpticalSystem, target_focal_length: float = 100.0) -> LensOptimizer:
     """
     Create optimizer for achromatic doublet
@@ -646,4 +763,8 @@ def create_doublet_optimizer(system: OpticalSystem, target_focal_length: float =
         OptimizationTarget("focal_length", target_focal_length, weight=100.0, target_type="target"),
     ]
     
-    return LensOptimizer(system, variables, targets)
+    optimizer = LensOptimizer(system, variables, targets)
+    optimizer._apply = _apply_vars_doublet
+    optimizer._merit = _make_merit_doublet(optimizer.merit_function, targets[0].weight,
+                                           targets[1].weight, target_focal_length)
+    return optimizer
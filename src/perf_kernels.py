@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Scalar kernels for optical performance metrics
+
+Plain arithmetic shared by PerformanceMetrics. Inputs are already
+validated by the caller (positive f-number, non-zero focal length).
+Wavelengths are in nanometers, lengths in millimeters.
+
+The kernels are a handful of floating point operations and are not
+memoized: an lru_cache lookup costs more than recomputing them.
+"""
+
+import math
+from typing import Tuple
+
+
+def f_number(efl: float, diameter: float) -> float:
+    """f/# = |f| / D"""
+    return abs(efl) / diameter
+
+
+def numerical_aperture(medium_index: float, half_angle_rad: float) -> float:
+    """NA = n * sin(θ)"""
+    return medium_index * math.sin(half_angle_rad)
+
+
+def rayleigh_um(wavelength_nm: float, f_num: float) -> float:
+    """Rayleigh spot resolution r = 1.22 * λ * f/# in micrometers"""
+    return 1.22 * (wavelength_nm / 1000.0) * f_num
+
+
+def mtf_cutoff_lpmm(wavelength_nm: float, f_num: float) -> float:
+    """Diffraction-limited MTF cutoff fc = 1 / (λ * f/#) in lp/mm"""
+    return 1.0 / (wavelength_nm * 1e-6 * f_num)
+
+
+def airy_radius_mm(wavelength_nm: float, f_num: float) -> float:
+    """Airy disk radius r = 1.22 * λ * f/# in mm"""
+    return 1.22 * (wavelength_nm * 1e-6) * f_num
+
+
+def field_of_view_deg(sensor_size: float, efl: float) -> float:
+    """FOV = 2 * arctan(d / 2f) in degrees"""
+    return math.degrees(2 * math.atan(sensor_size / (2 * abs(efl))))
+
+
+def depth_of_field(efl: float, f_num: float, coc: float,
+                   object_distance: float) -> Tuple[float, float, float, float]:
+    """
+    Depth of field limits.
+
+    Returns:
+        (near, far, total, hyperfocal) in mm; far and total are inf when
+        focused at or beyond the hyperfocal distance
+    """
+    H = efl**2 / (f_num * coc) + efl
+
+    if object_distance < H:
+        near = (object_distance * (H - efl)) / (H + object_distance - 2*efl)
+        far = (object_distance * (H - efl)) / (H - object_distance)
+        return near, far, far - near, H
+    return H / 2, float('inf'), float('inf'), H
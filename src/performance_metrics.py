@@ -7,15 +7,26 @@ Calculate professional optical specifications
 import math
 from typing import Optional, Dict, Any
 
+# NumPy is optional; only needed for the batch entry points
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 try:
     from .lens_editor import Lens
     from .optical_system import OpticalSystem
+    from . import perf_kernels as kernels
 except (ImportError, ValueError):
     import sys
     import os
     sys.path.insert(0, os.path.dirname(__file__))
     from lens_editor import Lens
     from optical_system import OpticalSystem
+    import perf_kernels as kernels
+
+# Depth of field circle of confusion in mm (typical for 35mm film)
+DEFAULT_CIRCLE_OF_CONFUSION_MM = 0.03
 
 
 class PerformanceMetrics:
@@ -33,6 +44,18 @@ class PerformanceMetrics:
             self.system = lens_or_system
         else:
             raise ValueError("Must provide Lens or OpticalSystem")
+        
+        self.invalidate()
+    
+    def invalidate(self) -> None:
+        """
+        Recompute the cached effective focal length.
+        Call after modifying the lens or system this calculator was created for.
+        """
+        if self.lens:
+            self._efl = self.lens.calculate_focal_length()
+        else:
+            self._efl = self.system.get_system_focal_length()
     
     def calculate_f_number(self, entrance_pupil_diameter: Optional[float] = None) -> Optional[float]:
         """
@@ -43,22 +66,39 @@ class PerformanceMetrics:
         Args:
             entrance_pupil_diameter: Optional custom entrance pupil diameter (mm)
         """
-        if self.lens:
-            f = self.lens.calculate_focal_length()
-            D = entrance_pupil_diameter if entrance_pupil_diameter else self.lens.diameter
-        elif self.system:
-            f = self.system.get_system_focal_length()
-            if entrance_pupil_diameter:
-                D = entrance_pupil_diameter
-            elif self.system.elements:
-                D = self.system.elements[0].lens.diameter
-            else:
-                D = None
-        else:
-            return None
+        return self._compute_f_number(self._efl, self._pupil_diameter(entrance_pupil_diameter))
+    
+    def calculate_f_number_batch(self, diameters: Any) -> Optional[Any]:
+        """
+        f-numbers of this focal length over a sweep of pupil diameters.
         
-        if f and D and D > 0:
-            return abs(f) / D
+        Args:
+            diameters: Array of entrance pupil diameters (mm)
+        
+        Returns:
+            Array of f-numbers, or None if the focal length is undefined
+        """
+        if np is None:
+            raise ImportError("calculate_f_number_batch requires numpy")
+        if not self._efl:
+            return None
+        return kernels.f_number(self._efl, np.asarray(diameters, dtype=np.float64))
+    
+    def _pupil_diameter(self, entrance_pupil_diameter: Optional[float] = None) -> Optional[float]:
+        """Entrance pupil diameter: the given value, else the first element's diameter"""
+        if entrance_pupil_diameter:
+            return entrance_pupil_diameter
+        if self.lens:
+            return self.lens.diameter
+        if self.system.elements:
+            return self.system.elements[0].lens.diameter
+        return None
+    
+    @staticmethod
+    def _compute_f_number(efl: Optional[float], D: Optional[float]) -> Optional[float]:
+        """f/# from focal length and pupil diameter, None if either is unusable"""
+        if efl and D and D > 0:
+            return kernels.f_number(efl, D)
         return None
     
     def calculate_numerical_aperture(self, half_angle_deg: Optional[float] = None, 
@@ -77,15 +117,13 @@ class PerformanceMetrics:
         """
         if half_angle_deg is not None:
             # Direct calculation from half-angle
-            theta_rad = math.radians(half_angle_deg)
-            return medium_index * math.sin(theta_rad)
+            return kernels.numerical_aperture(medium_index, math.radians(half_angle_deg))
         
         # Calculate from lens geometry
+        f = self._efl
         if self.lens:
-            f = self.lens.calculate_focal_length()
             D = self.lens.diameter
         elif self.system:
-            f = self.system.get_system_focal_length()
             if self.system.elements:
                 D = self.system.elements[0].lens.diameter
             else:
@@ -96,7 +134,7 @@ class PerformanceMetrics:
         if f and D and abs(f) > 0:
             # NA = sin(arctan(D/(2f))) ≈ D/(2f) for small angles
             half_angle = math.atan(D / (2 * abs(f)))
-            na = medium_index * math.sin(half_angle)
+            na = kernels.numerical_aperture(medium_index, half_angle)
             return min(na, medium_index)  # Can't exceed medium index
         return None
     
@@ -107,12 +145,12 @@ class PerformanceMetrics:
         """
         if self.lens:
             # For thin lens: BFL ≈ EFL - thickness/2
-            f = self.lens.calculate_focal_length()
+            f = self._efl
             if f:
                 return f - self.lens.thickness / 2
         elif self.system:
             # For system: focal point distance from last surface
-            f = self.system.get_system_focal_length()
+            f = self._efl
             if f and self.system.elements:
                 last_elem = self.system.elements[-1]
                 # Approximate: system focal length - distance to last surface
@@ -124,12 +162,7 @@ class PerformanceMetrics:
         Calculate working distance for given magnification
         WD = f * (1 + 1/M)
         """
-        if self.lens:
-            f = self.lens.calculate_focal_length()
-        elif self.system:
-            f = self.system.get_system_focal_length()
-        else:
-            return None
+        f = self._efl
         
         if f and magnification != 0:
             return abs(f) * (1 + 1/magnification)
@@ -140,12 +173,7 @@ class PerformanceMetrics:
         Calculate magnification for given object distance
         M = -v/u = f/(f-u)
         """
-        if self.lens:
-            f = self.lens.calculate_focal_length()
-        elif self.system:
-            f = self.system.get_system_focal_length()
-        else:
-            return None
+        f = self._efl
         
         if f and object_distance != f:
             return f / (f - object_distance)
@@ -193,10 +221,7 @@ class PerformanceMetrics:
         
         # Rayleigh resolution: r = 1.22 * λ * f/#
         # wavelength in nm, result in μm
-        wavelength_um = wavelength / 1000.0  # nm to μm
-        resolution_um = 1.22 * wavelength_um * f_number
-        
-        return resolution_um
+        return kernels.rayleigh_um(wavelength, f_number)
     
     def estimate_mtf_cutoff(self, wavelength: float = 550.0,
                            f_number: Optional[float] = None) -> Optional[float]:
@@ -219,13 +244,8 @@ class PerformanceMetrics:
         if f_number is None or f_number <= 0:
             return None
         
-        # Convert wavelength from nm to mm
-        wavelength_mm = wavelength * 1e-6
-        
         # MTF cutoff: fc = 1 / (λ * f/#)
-        mtf_cutoff = 1.0 / (wavelength_mm * f_number)
-        
-        return mtf_cutoff
+        return kernels.mtf_cutoff_lpmm(wavelength, f_number)
     
     def calculate_airy_disk_radius(self, wavelength: float = 550.0) -> Optional[float]:
         """
@@ -238,19 +258,16 @@ class PerformanceMetrics:
         Returns:
             Airy disk radius in mm
         """
-        wavelength_mm = wavelength * 1e-6  # nm to mm
-        
+        f = self._efl
         if self.lens:
-            f = self.lens.calculate_focal_length()
             D = self.lens.diameter
         elif self.system:
-            f = self.system.get_system_focal_length()
             D = self.system.elements[0].lens.diameter if self.system.elements else None
         else:
             return None
         
         if f and D and D > 0:
-            return 1.22 * wavelength_mm * abs(f) / D
+            return kernels.airy_radius_mm(wavelength, kernels.f_number(f, D))
         return None
     
     def calculate_field_of_view(self, sensor_size: float) -> Optional[float]:
@@ -265,52 +282,29 @@ class PerformanceMetrics:
         Returns:
             Field of view in degrees
         """
-        if self.lens:
-            f = self.lens.calculate_focal_length()
-        elif self.system:
-            f = self.system.get_system_focal_length()
-        else:
-            return None
-        
+        f = self._efl
         if f is None or abs(f) < 0.001:
             return None
         
         # FOV = 2 * arctan(d / 2f)
-        fov_rad = 2 * math.atan(sensor_size / (2 * abs(f)))
-        fov_deg = math.degrees(fov_rad)
-        
-        return fov_deg
+        return kernels.field_of_view_deg(sensor_size, f)
     
-    def calculate_depth_of_field(self, object_distance: float, 
-                                 circle_of_confusion: float = 0.03) -> Optional[Dict[str, float]]:
+    def calculate_depth_of_field(self, object_distance: float,
+                                 circle_of_confusion: float = DEFAULT_CIRCLE_OF_CONFUSION_MM
+                                 ) -> Optional[Dict[str, float]]:
         """
         Calculate depth of field
         CoC: circle of confusion in mm (0.03mm is typical for 35mm film)
         """
-        f_number = self.calculate_f_number()
-        
-        if self.lens:
-            f = self.lens.calculate_focal_length()
-        elif self.system:
-            f = self.system.get_system_focal_length()
-        else:
-            return None
+        f = self._efl
+        f_number = self._compute_f_number(f, self._pupil_diameter())
         
         if not (f and f_number and object_distance > 0):
             return None
         
-        # Hyperfocal distance
-        H = f**2 / (f_number * circle_of_confusion) + f
-        
-        # Near and far limits
-        if object_distance < H:
-            near = (object_distance * (H - f)) / (H + object_distance - 2*f)
-            far = (object_distance * (H - f)) / (H - object_distance)
-        else:
-            near = H / 2
-            far = float('inf')
-        
-        dof = far - near if far != float('inf') else float('inf')
+        # Hyperfocal distance and near/far limits
+        near, far, dof, H = kernels.depth_of_field(f, f_number, circle_of_confusion,
+                                                   object_distance)
         
         return {
             'near': near,
@@ -337,39 +331,45 @@ class PerformanceMetrics:
         """
         metrics = {}
         
-        # Focal length
-        if self.lens:
-            metrics['effective_focal_length'] = self.lens.calculate_focal_length()
-            metrics['entrance_pupil_diameter'] = entrance_pupil_diameter or self.lens.diameter
-        elif self.system:
-            metrics['effective_focal_length'] = self.system.get_system_focal_length()
+        # Focal length and pupil, computed once and shared by every metric
+        efl = self._efl
+        D_lens = self._pupil_diameter()
+        D = entrance_pupil_diameter or D_lens
+        metrics['effective_focal_length'] = efl
+        if self.system:
             metrics['system_length'] = self.system.get_total_length()
-            if self.system.elements:
-                metrics['entrance_pupil_diameter'] = entrance_pupil_diameter or self.system.elements[0].lens.diameter
+        if D_lens is not None:
+            metrics['entrance_pupil_diameter'] = D
         
         # Basic metrics
-        metrics['f_number'] = self.calculate_f_number(entrance_pupil_diameter)
+        f_num = self._compute_f_number(efl, D)
+        f_num_lens = self._compute_f_number(efl, D_lens)  # Lens aperture, ignoring a custom pupil
+        metrics['f_number'] = f_num
         metrics['numerical_aperture'] = self.calculate_numerical_aperture()
         metrics['back_focal_length'] = self.calculate_back_focal_length()
         metrics['working_distance_1x'] = self.calculate_working_distance(1.0)
         
         # Resolution metrics
-        f_num = metrics['f_number']
-        metrics['resolution_um'] = self.estimate_resolution_rayleigh(wavelength, f_num)
-        metrics['mtf_cutoff_lpmm'] = self.estimate_mtf_cutoff(wavelength, f_num)
+        f_res = f_num if f_num is not None else f_num_lens
+        has_f_res = f_res is not None and f_res > 0
+        metrics['resolution_um'] = kernels.rayleigh_um(wavelength, f_res) if has_f_res else None
+        metrics['mtf_cutoff_lpmm'] = (kernels.mtf_cutoff_lpmm(wavelength, f_res)
+                                      if has_f_res else None)
         metrics['rayleigh_limit_urad'] = self.calculate_resolution_rayleigh()
-        metrics['airy_disk_radius_mm'] = self.calculate_airy_disk_radius(wavelength)
+        metrics['airy_disk_radius_mm'] = (kernels.airy_radius_mm(wavelength, f_num_lens)
+                                          if f_num_lens is not None else None)
         
         # Field of view
         metrics['field_of_view_deg'] = self.calculate_field_of_view(sensor_size)
         
-        # Depth of field
-        dof = self.calculate_depth_of_field(object_distance)
-        if dof:
-            metrics['dof_near_mm'] = dof['near']
-            metrics['dof_far_mm'] = dof['far']
-            metrics['dof_total_mm'] = dof['total']
-            metrics['hyperfocal_mm'] = dof['hyperfocal']
+        # Depth of field (at the lens aperture, as calculate_depth_of_field)
+        if efl and f_num_lens and object_distance > 0:
+            near, far, total, H = kernels.depth_of_field(
+                efl, f_num_lens, DEFAULT_CIRCLE_OF_CONFUSION_MM, object_distance)
+            metrics['dof_near_mm'] = near
+            metrics['dof_far_mm'] = far
+            metrics['dof_total_mm'] = total
+            metrics['hyperfocal_mm'] = H
         
         return metrics
     
@@ -4,9 +4,12 @@ Preset Lens Library
 Common lens designs and industry standard templates
 """
 
+import copy
 import json
+import uuid
+from datetime import datetime
 from typing import List, Dict, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 try:
     from .lens import Lens
@@ -31,163 +34,200 @@ class LensPreset:
     typical_use: Optional[str] = None
 
 
-class PresetLibrary:
-    """Library of preset lens designs"""
-    
-    def __init__(self):
-        self.presets: Dict[str, LensPreset] = {}
-        self._load_common_presets()
+def _build_default_presets() -> List[LensPreset]:
+    """Build the common preset lenses"""
+    presets = []
     
-    def _load_common_presets(self):
-        """Load common preset lenses"""
-        
-        # Simple lenses
-        self.add_preset(LensPreset(
+    # Simple lenses
+    presets.append(LensPreset(
+        name="50mm Biconvex",
+        category="Simple Lenses",
+        description="Standard biconvex lens, 50mm focal length",
+        lens=Lens(
             name="50mm Biconvex",
-            category="Simple Lenses",
-            description="Standard biconvex lens, 50mm focal length",
-            lens=Lens(
-                name="50mm Biconvex",
-                radius_of_curvature_1=51.5,
-                radius_of_curvature_2=-51.5,
-                thickness=5.0,
-                diameter=25.4,
-                material="BK7"
-            ),
-            typical_use="General purpose focusing, magnification"
-        ))
-        
-        self.add_preset(LensPreset(
+            radius_of_curvature_1=51.5,
+            radius_of_curvature_2=-51.5,
+            thickness=5.0,
+            diameter=25.4,
+            material="BK7"
+        ),
+        typical_use="General purpose focusing, magnification"
+    ))
+    
+    presets.append(LensPreset(
+        name="100mm Plano-Convex",
+        category="Simple Lenses",
+        description="Plano-convex lens, 100mm focal length",
+        lens=Lens(
             name="100mm Plano-Convex",
-            category="Simple Lenses",
-            description="Plano-convex lens, 100mm focal length",
-            lens=Lens(
-                name="100mm Plano-Convex",
-                radius_of_curvature_1=51.5,
-                radius_of_curvature_2=1e10,  # Flat
-                thickness=4.0,
-                diameter=25.4,
-                material="BK7"
-            ),
-            typical_use="Collimation, beam shaping"
-        ))
-        
-        self.add_preset(LensPreset(
+            radius_of_curvature_1=51.5,
+            radius_of_curvature_2=1e10,  # Flat
+            thickness=4.0,
+            diameter=25.4,
+            material="BK7"
+        ),
+        typical_use="Collimation, beam shaping"
+    ))
+    
+    presets.append(LensPreset(
+        name="-50mm Biconcave",
+        category="Simple Lenses",
+        description="Biconcave lens, -50mm focal length (diverging)",
+        lens=Lens(
             name="-50mm Biconcave",
-            category="Simple Lenses",
-            description="Biconcave lens, -50mm focal length (diverging)",
-            lens=Lens(
-                name="-50mm Biconcave",
-                radius_of_curvature_1=-51.5,
-                radius_of_curvature_2=51.5,
-                thickness=2.5,
-                diameter=25.4,
-                material="BK7"
-            ),
-            typical_use="Beam expansion, reducing convergence"
-        ))
-        
-        # Eyepieces
-        self.add_preset(LensPreset(
-            name="25mm Plossl Eyepiece",
-            category="Eyepieces",
-            description="Classic Plossl design, 25mm focal length",
-            lens=Lens(
-                name="25mm Plossl",
-                radius_of_curvature_1=30.0,
-                radius_of_curvature_2=-30.0,
-                thickness=8.0,
-                diameter=24.0,
-                material="BK7"
-            ),
-            typical_use="Telescope eyepiece, 50° field of view"
-        ))
-        
-        # Objectives
-        self.add_preset(LensPreset(
-            name="Microscope 10x Objective",
-            category="Objectives",
-            description="Microscope objective, 10x magnification",
-            lens=Lens(
-                name="10x Objective",
-                radius_of_curvature_1=8.0,
-                radius_of_curvature_2=-12.0,
-                thickness=6.0,
-                diameter=18.0,
-                material="BK7"
-            ),
-            typical_use="Microscopy, 10x magnification"
-        ))
-        
-        # Condensers
-        self.add_preset(LensPreset(
+            radius_of_curvature_1=-51.5,
+            radius_of_curvature_2=51.5,
+            thickness=2.5,
+            diameter=25.4,
+            material="BK7"
+        ),
+        typical_use="Beam expansion, reducing convergence"
+    ))
+    
+    # Eyepieces
+    presets.append(LensPreset(
+        name="25mm Plossl Eyepiece",
+        category="Eyepieces",
+        description="Classic Plossl design, 25mm focal length",
+        lens=Lens(
+            name="25mm Plossl",
+            radius_of_curvature_1=30.0,
+            radius_of_curvature_2=-30.0,
+            thickness=8.0,
+            diameter=24.0,
+            material="BK7"
+        ),
+        typical_use="Telescope eyepiece, 50° field of view"
+    ))
+    
+    # Objectives
+    presets.append(LensPreset(
+        name="Microscope 10x Objective",
+        category="Objectives",
+        description="Microscope objective, 10x magnification",
+        lens=Lens(
+            name="10x Objective",
+            radius_of_curvature_1=8.0,
+            radius_of_curvature_2=-12.0,
+            thickness=6.0,
+            diameter=18.0,
+            material="BK7"
+        ),
+        typical_use="Microscopy, 10x magnification"
+    ))
+    
+    # Condensers
+    presets.append(LensPreset(
+        name="Abbe Condenser",
+        category="Condensers",
+        description="Two-element Abbe condenser for microscopy",
+        lens=Lens(
             name="Abbe Condenser",
-            category="Condensers",
-            description="Two-element Abbe condenser for microscopy",
-            lens=Lens(
-                name="Abbe Condenser",
-                radius_of_curvature_1=20.0,
-                radius_of_curvature_2=-20.0,
-                thickness=12.0,
-                diameter=30.0,
-                material="BK7"
-            ),
-            typical_use="Microscope illumination"
-        ))
-        
-        # Laser optics
-        self.add_preset(LensPreset(
-            name="Laser Focusing Lens 532nm",
-            category="Laser Optics",
-            description="Optimized for green laser (532nm)",
-            lens=Lens(
-                name="532nm Focus",
-                radius_of_curvature_1=75.0,
-                radius_of_curvature_2=-75.0,
-                thickness=4.0,
-                diameter=12.7,
-                material="BK7",
-                wavelength=532.0
-            ),
-            typical_use="Laser beam focusing, 532nm wavelength"
-        ))
+            radius_of_curvature_1=20.0,
+            radius_of_curvature_2=-20.0,
+            thickness=12.0,
+            diameter=30.0,
+            material="BK7"
+        ),
+        typical_use="Microscope illumination"
+    ))
+    
+    # Laser optics
+    presets.append(LensPreset(
+        name="Laser Focusing Lens 532nm",
+        category="Laser Optics",
+        description="Optimized for green laser (532nm)",
+        lens=Lens(
+            name="532nm Focus",
+            radius_of_curvature_1=75.0,
+            radius_of_curvature_2=-75.0,
+            thickness=4.0,
+            diameter=12.7,
+            material="BK7",
+            wavelength=532.0
+        ),
+        typical_use="Laser beam focusing, 532nm wavelength"
+    ))
+    
+    # Camera lenses
+    presets.append(LensPreset(
+        name="50mm Camera Lens Element",
+        category="Camera Optics",
+        description="Single element approximation of 50mm camera lens",
+        lens=Lens(
+            name="50mm Camera",
+            radius_of_curvature_1=45.0,
+            radius_of_curvature_2=-55.0,
+            thickness=6.0,
+            diameter=40.0,
+            material="BK7"
+        ),
+        typical_use="Photography, normal field of view"
+    ))
+    
+    # UV/IR optics
+    presets.append(LensPreset(
+        name="UV Fused Silica Lens",
+        category="Specialty Optics",
+        description="UV-grade fused silica, 100mm focal length",
+        lens=Lens(
+            name="UV Lens",
+            radius_of_curvature_1=91.5,
+            radius_of_curvature_2=-91.5,
+            thickness=5.0,
+            diameter=25.4,
+            material="FUSEDSILICA",
+            wavelength=355.0
+        ),
+        typical_use="UV applications, spectroscopy"
+    ))
+    return presets
+
+
+def _search_text(preset: LensPreset) -> str:
+    """
+    Lower-cased search text; the NUL separator keeps a query from matching
+    across name and description
+    """
+    return f"{preset.name}\0{preset.description}".lower()
+
+
+# Default presets are built once per process; each PresetLibrary works on copies
+_DEFAULT_PRESETS = tuple(_build_default_presets())
+_DEFAULT_SEARCH_TEXTS = tuple(_search_text(p) for p in _DEFAULT_PRESETS)
+
+
+class PresetLibrary:
+    """Library of preset lens designs"""
+    
+    def __init__(self):
+        # Lenses are copied so that editing one library's presets never
+        # leaks into another
+        presets = [replace(p, lens=copy.copy(p.lens)) for p in _DEFAULT_PRESETS]
         
-        # Camera lenses
-        self.add_preset(LensPreset(
-            name="50mm Camera Lens Element",
-            category="Camera Optics",
-            description="Single element approximation of 50mm camera lens",
-            lens=Lens(
-                name="50mm Camera",
-                radius_of_curvature_1=45.0,
-                radius_of_curvature_2=-55.0,
-                thickness=6.0,
-                diameter=40.0,
-                material="BK7"
-            ),
-            typical_use="Photography, normal field of view"
-        ))
+        # Indexed by name for get_preset
+        self.presets: Dict[str, LensPreset] = {p.name: p for p in presets}
         
-        # UV/IR optics
-        self.add_preset(LensPreset(
-            name="UV Fused Silica Lens",
-            category="Specialty Optics",
-            description="UV-grade fused silica, 100mm focal length",
-            lens=Lens(
-                name="UV Lens",
-                radius_of_curvature_1=91.5,
-                radius_of_curvature_2=-91.5,
-                thickness=5.0,
-                diameter=25.4,
-                material="FUSEDSILICA",
-                wavelength=355.0
-            ),
-            typical_use="UV applications, spectroscopy"
-        ))
+        # Parallel per-preset columns scanned by list_presets and
+        # search_presets; _rows maps a preset name to its row
+        self._rows: Dict[str, int] = {p.name: i for i, p in enumerate(presets)}
+        self._entries: List[LensPreset] = presets
+        self._categories: List[str] = [p.category for p in presets]
+        self._search_texts: List[str] = list(_DEFAULT_SEARCH_TEXTS)
     
     def add_preset(self, preset: LensPreset):
         """Add a preset to the library"""
         self.presets[preset.name] = preset
+        row = self._rows.get(preset.name)
+        if row is None:
+            self._rows[preset.name] = len(self._entries)
+            self._entries.append(preset)
+            self._categories.append(preset.category)
+            self._search_texts.append(_search_text(preset))
+        else:
+            self._entries[row] = preset
+            self._categories[row] = preset.category
+            self._search_texts[row] = _search_text(preset)
     
     def get_preset(self, name: str) -> Optional[LensPreset]:
         """Get preset by name"""
@@ -196,51 +236,38 @@ class PresetLibrary:
     def list_presets(self, category: Optional[str] = None) -> List[LensPreset]:
         """List all presets, optionally filtered by category"""
         if category:
-            return [p for p in self.presets.values() if p.category == category]
-        return list(self.presets.values())
+            entries = self._entries
+            return [entries[i] for i, c in enumerate(self._categories) if c == category]
+        return list(self._entries)
     
     def list_categories(self) -> List[str]:
         """Get list of all categories"""
-        categories = set(p.category for p in self.presets.values())
-        return sorted(categories)
+        return sorted(set(self._categories))
     
     def search_presets(self, query: str) -> List[LensPreset]:
         """Search presets by name or description"""
         query_lower = query.lower()
-        results = []
-        for preset in self.presets.values():
-            if (query_lower in preset.name.lower() or 
-                query_lower in preset.description.lower()):
-                results.append(preset)
-        return results
+        entries = self._entries
+        return [entries[i] for i, text in enumerate(self._search_texts)
+                if query_lower in text]
     
     def get_lens_copy(self, preset_name: str) -> Optional[Lens]:
         """Get a copy of the lens from a preset"""
-        preset = self.get_preset(preset_name)
-        if preset:
-            # Create a new lens with the same parameters
-            lens = preset.lens
-            return Lens(
-                name=lens.name,
-                radius_of_curvature_1=lens.radius_of_curvature_1,
-                radius_of_curvature_2=lens.radius_of_curvature_2,
-                thickness=lens.thickness,
-                diameter=lens.diameter,
-                refractive_index=lens.refractive_index,
-                lens_type=lens.lens_type,
-                material=lens.material,
-                wavelength=lens.wavelength,
-                temperature=lens.temperature
-            )
-        return None
+        preset = self.presets.get(preset_name)
+        if preset is None:
+            return None
+        
+        # Copy the preset lens directly; the copy is a new lens with its own identity
+        lens = copy.copy(preset.lens)
+        lens.id = uuid.uuid4().hex
+        lens.created_at = lens.modified_at = datetime.now().isoformat()
+        return lens
 
 
-# Singleton instance
-_preset_library = None
+# Singleton instance, created eagerly at import (the defaults above are
+# already built, so this is only a handful of lens copies)
+_preset_library = PresetLibrary()
 
 def get_preset_library() -> PresetLibrary:
     """Get the singleton preset library instance"""
-    global _preset_library
-    if _preset_library is None:
-        _preset_library = PresetLibrary()
     return _preset_library
@@ -4,8 +4,12 @@ Ray Tracing Engine for Optical Lens Simulation
 Implements Snell's law and ray propagation through lens elements
 """
 
+import importlib
+import logging
 import math
-from typing import List, Optional, Tuple, Any
+from typing import List, Optional, Sequence, Tuple, Any
+
+logger = logging.getLogger(__name__)
 
 # Import vector class
 try:
@@ -115,6 +119,27 @@ except ImportError:
     PolarizationCalculator = None
     HAS_POLARIZATION = False
 
+# Import vectorized ray bundle kernels (require numpy). Only a missing
+# numpy or kernels module means they are unavailable; any other failure
+# is a bug and is logged
+_KERNELS_MODULE = f"{__package__}.ray_kernels" if __package__ else "ray_kernels"
+try:
+    _ray_kernels = importlib.import_module(_KERNELS_MODULE)
+except ModuleNotFoundError as e:
+    _ray_kernels = None
+    if e.name not in ('numpy', _KERNELS_MODULE):
+        logger.exception("Could not import the ray kernels")
+except Exception:
+    _ray_kernels = None
+    logger.exception("Could not import the ray kernels")
+
+# The bundle kernel is the NumPy one when numba is missing or its kernels
+# failed to compile; the compiled single-ray kernels are used only with numba
+refract_bundle = _ray_kernels.refract_bundle if _ray_kernels else None
+HAS_NUMBA = bool(_ray_kernels and _ray_kernels.HAS_NUMBA)
+_trace_lens_ray = _ray_kernels.trace_lens_ray if HAS_NUMBA else None
+_trace_lens_rays = _ray_kernels.trace_lens_rays if HAS_NUMBA else None
+
 # Import constants
 try:
     from .constants import (
@@ -140,19 +165,68 @@ class Ray:
         angle: Angle in radians (from horizontal, positive = upward)
         wavelength: Wavelength in mm (default 0.000550 = 550nm green)
         n: Current refractive index the ray is traveling through
-        path: List of (x, y) points along the ray path
+        path: (n_points, 2) array of (x, y) points along the ray path
+        n_points: Number of points recorded in path
+    
+    The ray state (x, y, angle) is always kept in double precision; `dtype`
+    only sets the storage type of the recorded path (float64 by default).
     """
     
-    def __init__(self, x: float = 0.0, y: float = 0.0, angle_rad: float = 0.0, 
-                 wavelength_mm: float = WAVELENGTH_GREEN * NM_TO_MM, n: float = REFRACTIVE_INDEX_AIR, **kwargs) -> None:
+    __slots__ = ('x', 'y', 'angle_rad', 'wavelength', 'n', '_path', 'n_points', 'terminated')
+    
+    def __init__(self, x: float = 0.0, y: float = 0.0, angle_rad: float = 0.0,
+                 wavelength_mm: float = WAVELENGTH_GREEN * NM_TO_MM,
+                 n: float = REFRACTIVE_INDEX_AIR,
+                 max_segments: int = 32, dtype: Any = None, **kwargs) -> None:
         self.x = kwargs.get('x_mm', x)
         self.y = kwargs.get('y_mm', y)
         self.angle_rad = kwargs.get('angle_rad', angle_rad)
         self.wavelength = kwargs.get('wavelength_mm', wavelength_mm)
         self.n = n
-        self.path: List[Tuple[float, float]] = [(self.x, self.y)]
+        # Path points live in a pre-sized contiguous buffer; `path` exposes
+        # the filled part. Falls back to a plain list without numpy.
+        if np is not None:
+            self._path = np.empty((max(max_segments, 1), 2),
+                                  dtype=np.float64 if dtype is None else dtype)
+        else:
+            self._path = [None] * max(max_segments, 1)
+        self.n_points = 0
+        self._append_point(self.x, self.y)
         self.terminated = False
 
+    @property
+    def path(self) -> Any:
+        """Points along the ray path (view of the first n_points entries)."""
+        return self._path[:self.n_points]
+
+    def _append_point(self, x: float, y: float) -> None:
+        """Record a point on the ray path, growing the buffer when full."""
+        if self.n_points == len(self._path):
+            if np is not None:
+                self._path = np.concatenate((self._path, np.empty_like(self._path)))
+            else:
+                self._path.extend([None] * len(self._path))
+        self._path[self.n_points] = (x, y)
+        self.n_points += 1
+
+    def _extend_path(self, points: Any) -> None:
+        """Record an (n, 2) array of path points in one copy (numpy storage only)."""
+        end = self.n_points + len(points)
+        while end > len(self._path):
+            self._path = np.concatenate((self._path, np.empty_like(self._path)))
+        self._path[self.n_points:end] = points
+        self.n_points = end
+
+    def _ends_at(self, x: float, y: float) -> bool:
+        """True if the last recorded path point is (x, y)."""
+        if self.n_points == 0:
+            return False
+        last = self._path[self.n_points - 1]
+        if np is not None:
+            # Compare at storage precision so float32 paths still match
+            x, y = self._path.dtype.type(x), self._path.dtype.type(y)
+        return last[0] == x and last[1] == y
+
     @property
     def angle(self) -> float:
         """Alias for angle_rad for backward compatibility."""
@@ -175,7 +249,7 @@ class Ray:
         """Propagate ray in current direction"""
         self.x += distance_mm * math.cos(self.angle_rad)
         self.y += distance_mm * math.sin(self.angle_rad)
-        self.path.append((self.x, self.y))
+        self._append_point(self.x, self.y)
     
     def refract(self, n1: float, n2: float, surface_normal_angle: float = 0.0, **kwargs) -> bool:
         """
@@ -217,15 +291,20 @@ class LensRayTracer:
     Traces rays through a lens using Snell's law at each surface.
     """
     
-    def __init__(self, lens: Any, x_offset: float = 0.0) -> None:
+    def __init__(self, lens: Any, x_offset: float = 0.0, dtype: Any = None) -> None:
         """
         Initialize ray tracer with a lens.
         
         Args:
             lens: Lens object with optical parameters
             x_offset: X position of the front vertex (mm)
+            dtype: Storage type for the paths of rays created by this tracer
+                and for batched positions/directions. Defaults to float32,
+                which is well below display precision and halves memory
+                traffic; pass np.float64 for full precision.
         """
         self.lens = lens
+        self.dtype = (np.float32 if dtype is None else dtype) if np is not None else None
         self.R1 = lens.radius_of_curvature_1
         self.R2 = lens.radius_of_curvature_2
         self.d = lens.thickness
@@ -259,6 +338,12 @@ class LensRayTracer:
             self.front_center_x = self.front_vertex_x + self.R1
             self.front_is_flat = False
         
+        # Axial extent of the front sphere and a slightly padded aperture,
+        # for culling rays that cannot reach the front surface
+        R1_abs = abs(self.R1)
+        self._front_x_range = (self.front_center_x - R1_abs, self.front_center_x + R1_abs)
+        self._cull_height = self.D / 2 * (1 + 1e-9) + 1e-9
+        
         # Back surface (R2)
         if abs(self.R2) > LARGE_NUMBER or not math.isfinite(self.R2) or abs(self.R2) < EPSILON:  # Essentially flat or zero radius
             self.back_center_x = self.back_vertex_x
@@ -266,6 +351,16 @@ class LensRayTracer:
         else:
             self.back_center_x = self.back_vertex_x + self.R2
             self.back_is_flat = False
+        
+        # Lens arguments and path buffer for the compiled trace_ray kernel
+        self._kernel_lens = (
+            self.front_is_flat, float(self.front_vertex_x), float(self.front_center_x),
+            float(self.R1),
+            self.back_is_flat, float(self.back_vertex_x), float(self.back_center_x),
+            float(self.R2),
+            float(self.D), float(self.n), float(REFRACTIVE_INDEX_AIR),
+        )
+        self._kernel_points = np.empty((4, 2)) if np is not None else None
 
             
     def _get_surface_normal_angle(self, x: float, y: float, surface_type: str) -> float:
@@ -322,6 +417,16 @@ class LensRayTracer:
             dx = math.cos(ray.angle)
             dy = math.sin(ray.angle)
             
+            # Every intersection lies within the sphere's axial extent; if the
+            # ray's line stays beyond the aperture across all of it, it misses
+            if abs(dx) > EPSILON:
+                x_lo, x_hi = self._front_x_range
+                y_lo = ray.y + (x_lo - ray.x) * dy / dx
+                y_hi = ray.y + (x_hi - ray.x) * dy / dx
+                h = self._cull_height
+                if (y_lo > h and y_hi > h) or (y_lo < -h and y_hi < -h):
+                    return None
+            
             # Use common sphere intersection helper
             t_solutions = OpticalIntersector.intersect_sphere(
                 ray.x, ray.y, 0, dx, dy, 0, cx, 0, 0, R
@@ -523,6 +628,9 @@ class LensRayTracer:
     
     def trace_ray(self, ray: Ray, propagate_distance: float = (DEFAULT_RADIUS_1)) -> Ray:
         """Trace a ray through the lens."""
+        if _trace_lens_ray is not None:
+            return self._trace_ray_compiled(ray, propagate_distance)
+        
         # Find intersection with front surface
         intersection = self._intersect_front_surface(ray)
         
@@ -544,8 +652,8 @@ class LensRayTracer:
              pass
 
         ray.x, ray.y = x1, y1
-        if len(ray.path) == 0 or ray.path[-1] != (x1, y1):
-            ray.path.append((x1, y1))
+        if not ray._ends_at(x1, y1):
+            ray._append_point(x1, y1)
         
         # Refract at front surface
         normal_angle = self._get_surface_normal_angle(x1, y1, 'front')
@@ -570,15 +678,15 @@ class LensRayTracer:
                     # Check if this exit is physically within lens volume (between surfaces)
                     # For simplicity in this engine, we let it exit at the diameter
                     ray.x, ray.y = x_side, y_side
-                    ray.path.append((x_side, y_side))
+                    ray._append_point(x_side, y_side)
             
             ray.terminated = True
             return ray
         
         x2, y2 = intersection
         ray.x, ray.y = x2, y2
-        if len(ray.path) == 0 or ray.path[-1] != (x2, y2):
-            ray.path.append((x2, y2))
+        if not ray._ends_at(x2, y2):
+            ray._append_point(x2, y2)
         
         # Refract at back surface
         normal_angle = self._get_surface_normal_angle(x2, y2, 'back')
@@ -593,16 +701,116 @@ class LensRayTracer:
         
         return ray
     
-    def trace_parallel_rays(self, num_rays: int = DEFAULT_NUM_RAYS, 
-                           ray_height_range: Optional[Tuple[float, float]] = None, 
-                           wavelength_mm: float = WAVELENGTH_GREEN * NM_TO_MM,
-                           angle_deg: float = 0.0) -> List[Ray]:
-        """Trace parallel rays (collimated beam) through the lens."""
+    def _trace_ray_compiled(self, ray: Ray, propagate_distance: float) -> Ray:
+        """trace_ray through the compiled trace_lens_ray kernel."""
+        points = self._kernel_points
+        # Surface hits equal to the last recorded point are not recorded again
+        points[0] = ray._path[ray.n_points - 1] if ray.n_points else np.nan
+        ray.x, ray.y, ray.angle_rad, ray.n, terminated, count = _trace_lens_ray(
+            float(ray.x), float(ray.y), float(ray.angle_rad), float(ray.n), *self._kernel_lens,
+            float(propagate_distance), EPSILON, ray._path.dtype == np.float32, points)
+        
+        ray._extend_path(points[1:count])
+        if terminated:
+            ray.terminated = True
+        return ray
+    
+    def trace_rays(self, rays: List[Ray],
+                   propagate_distance: float = DEFAULT_RADIUS_1) -> List[Ray]:
+        """
+        Trace several rays through the lens, as trace_ray does for each.
+        
+        With numba installed the rays are traced in parallel by one
+        compiled call.
+        """
+        if _trace_lens_rays is None or not rays:
+            for ray in rays:
+                self.trace_ray(ray, propagate_distance)
+            return rays
+        
+        xs = np.array([ray.x for ray in rays], dtype=np.float64)
+        ys = np.array([ray.y for ray in rays], dtype=np.float64)
+        angles = np.array([ray.angle_rad for ray in rays], dtype=np.float64)
+        ns = np.array([ray.n for ray in rays], dtype=np.float64)
+        round32 = np.array([ray._path.dtype == np.float32 for ray in rays])
+        points = np.empty((len(rays), 4, 2))
+        # Row 0 per ray is its last recorded point, for skipping duplicates
+        points[:, 0] = [ray._path[ray.n_points - 1] if ray.n_points else (np.nan, np.nan)
+                        for ray in rays]
+        return self._trace_ray_arrays(rays, xs, ys, angles, ns, round32, points,
+                                      propagate_distance)
+    
+    def _trace_ray_arrays(self, rays: List[Ray], xs: Any, ys: Any, angles: Any, ns: Any,
+                          round32: Any, points: Any, propagate_distance: float) -> List[Ray]:
+        """
+        Run the compiled batch kernel on packed ray state and write it back.
+        
+        Args:
+            rays: Rays to update, one per array entry
+            xs, ys, angles, ns: float64 ray state, updated in place
+            round32: Per-ray flag for float32 path storage
+            points: (N, 4, 2) float64 scratch; row 0 holds each ray's last
+                recorded path point
+            propagate_distance: Distance to propagate past the back surface (mm)
+        """
+        terminated = np.zeros(len(rays), dtype=np.bool_)
+        counts = np.zeros(len(rays), dtype=np.int64)
+        _trace_lens_rays(xs, ys, angles, ns, *self._kernel_lens, float(propagate_distance),
+                         EPSILON, round32, points, terminated, counts)
+        
+        for ray, x, y, angle, n, stopped, count, ray_points in zip(
+                rays, xs.tolist(), ys.tolist(), angles.tolist(), ns.tolist(),
+                terminated.tolist(), counts.tolist(), points):
+            ray.x, ray.y, ray.angle_rad, ray.n = x, y, angle, n
+            if count > 1:
+                ray._extend_path(ray_points[1:count])
+            if stopped:
+                ray.terminated = True
+        return rays
+    
+    def _trace_batch(self, xs: Any, ys: Any, angles: Any) -> Tuple[Any, Any, Any]:
+        """
+        Trace a bundle of rays through both lens surfaces at once.
+        
+        Args:
+            xs, ys, angles: Arrays of starting positions (mm) and angles (radians)
+        
+        Returns:
+            (origins, dirs, alive): (N, 2) exit points on the back surface,
+            (N, 2) unit exit directions and the (N,) mask of rays that passed
+            both surfaces. Entries for rays that were stopped keep the state
+            at the surface where they were stopped.
+        """
+        if refract_bundle is None:
+            raise ImportError("Batched ray tracing requires numpy")
+        
+        angles = np.asarray(angles, dtype=np.float64)
+        origins = np.column_stack((np.asarray(xs, dtype=np.float64),
+                                   np.asarray(ys, dtype=np.float64)))
+        dirs = np.column_stack((np.cos(angles), np.sin(angles)))
+        alive = np.ones(len(origins), dtype=np.bool_)
+        
+        semi_aperture = self.D / 2
+        c1 = 0.0 if self.front_is_flat else 1.0 / self.R1
+        c2 = 0.0 if self.back_is_flat else 1.0 / self.R2
+        refract_bundle(origins, dirs, alive, self.front_vertex_x, c1, semi_aperture,
+                       REFRACTIVE_INDEX_AIR, self.n)
+        refract_bundle(origins, dirs, alive, self.back_vertex_x, c2, semi_aperture,
+                       self.n, REFRACTIVE_INDEX_AIR)
+        return origins, dirs, alive
+    
+    def _parallel_ray_starts(self, num_rays: int,
+                             ray_height_range: Optional[Tuple[float, float]],
+                             angle_deg: float) -> Tuple[float, Any, float]:
+        """
+        Start x, start heights and angle (radians) of a collimated beam.
+        
+        The heights are an array when numpy is available, else a list.
+        """
         if ray_height_range is None:
             max_height = self.D / 2 * 0.95  # Use 95% of aperture
             ray_height_range = (-max_height, max_height)
         
-        rays = []
         min_h, max_h = ray_height_range
         angle_rad = math.radians(angle_deg)
         
@@ -612,16 +820,149 @@ class LensRayTracer:
         # Calculate lens position (x=0) for target height
         lens_x = 0.0
         
+        if np is not None:
+            if num_rays == 1:
+                heights = np.zeros(1)
+            else:
+                heights = min_h + (max_h - min_h) * np.arange(num_rays) / (num_rays - 1)
+            return start_x, heights - (lens_x - start_x) * math.tan(angle_rad), angle_rad
+        
+        y_starts = []
         for i in range(num_rays):
             if num_rays == 1:
                 height = 0
             else:
                 height = min_h + (max_h - min_h) * i / (num_rays - 1)
-            
-            y_start = height - (lens_x - start_x) * math.tan(angle_rad)
-            
-            ray = Ray(start_x, y_start, angle_rad, wavelength_mm=wavelength_mm)
-            self.trace_ray(ray)
+            y_starts.append(height - (lens_x - start_x) * math.tan(angle_rad))
+        
+        return start_x, y_starts, angle_rad
+    
+    def trace_parallel_rays_soa(self, num_rays: int = DEFAULT_NUM_RAYS,
+                                ray_height_range: Optional[Tuple[float, float]] = None,
+                                angle_deg: float = 0.0,
+                                propagate_distance: float = DEFAULT_RADIUS_1,
+                                out: Any = None) -> Tuple[Any, Any, Any, Any, Any]:
+        """
+        Trace a collimated beam through the lens as arrays, one entry per ray.
+        
+        Args:
+            num_rays: Number of rays in the beam
+            ray_height_range: (min, max) ray height at the lens; defaults to
+                95% of the aperture
+            angle_deg: Beam angle to the optical axis (degrees)
+            propagate_distance: Distance to propagate past the back surface (mm)
+            out: Optional (M, 4, 2) array with M >= num_rays; the paths are
+                written to its first num_rays rows instead of a new array
+        
+        Returns:
+            (xs, ys, angles, paths, alive): final positions (mm) and angles
+            (radians), (N, 4, 2) path points (start, front surface, back
+            surface, end) and the (N,) mask of rays that passed both
+            surfaces. Path points after the start are NaN for stopped rays.
+        """
+        start_x, y_starts, angle_rad = self._parallel_ray_starts(
+            num_rays, ray_height_range, angle_deg)
+        return self._trace_parallel_bundle(start_x, y_starts, angle_rad, propagate_distance, out)
+    
+    def _trace_parallel_bundle(self, start_x: float, y_starts: Any, angle_rad: float,
+                               propagate_distance: float,
+                               out: Any = None) -> Tuple[Any, Any, Any, Any, Any]:
+        """Array trace behind trace_parallel_rays_soa, from explicit start points."""
+        if refract_bundle is None:
+            raise ImportError("Batched ray tracing requires numpy")
+        
+        # Ray state is traced in double precision, as by trace_ray; only the
+        # paths are stored in the tracer's dtype
+        num_rays = len(y_starts)
+        front = np.empty((num_rays, 2), dtype=np.float64)
+        front[:, 0] = start_x
+        front[:, 1] = y_starts
+        
+        # A collimated beam shares one direction, so its cos/sin are taken
+        # once instead of per ray
+        origins = front.copy()
+        dirs = np.empty_like(front)
+        dirs[:, 0] = math.cos(angle_rad)
+        dirs[:, 1] = math.sin(angle_rad)
+        alive = np.ones(num_rays, dtype=np.bool_)
+        
+        semi_aperture = self.D / 2
+        c1 = 0.0 if self.front_is_flat else 1.0 / self.R1
+        c2 = 0.0 if self.back_is_flat else 1.0 / self.R2
+        refract_bundle(origins, dirs, alive, self.front_vertex_x, c1, semi_aperture,
+                       REFRACTIVE_INDEX_AIR, self.n)
+        hits = origins.copy()
+        refract_bundle(origins, dirs, alive, self.back_vertex_x, c2, semi_aperture,
+                       self.n, REFRACTIVE_INDEX_AIR)
+        
+        end = origins + propagate_distance * dirs
+        paths = np.stack((front, hits, origins, end), axis=1,
+                         out=(np.empty((num_rays, 4, 2), dtype=self.dtype) if out is None
+                              else out[:num_rays]))
+        paths[~alive, 1:] = np.nan
+        
+        angles = np.arctan2(dirs[:, 1], dirs[:, 0])
+        return end[:, 0], end[:, 1], angles, paths, alive
+    
+    def trace_parallel_rays(self, num_rays: int = DEFAULT_NUM_RAYS,
+                            ray_height_range: Optional[Tuple[float, float]] = None,
+                            wavelength_mm: float = WAVELENGTH_GREEN * NM_TO_MM,
+                            angle_deg: float = 0.0) -> List[Ray]:
+        """Trace parallel rays (collimated beam) through the lens."""
+        start_x, y_starts, angle_rad = self._parallel_ray_starts(
+            num_rays, ray_height_range, angle_deg)
+        
+        if refract_bundle is None:
+            rays = []
+            for y_start in y_starts:
+                ray = Ray(start_x, y_start, angle_rad, wavelength_mm=wavelength_mm)
+                self.trace_ray(ray)
+                rays.append(ray)
+            return rays
+        
+        bundle = self._trace_parallel_bundle(start_x, y_starts, angle_rad, DEFAULT_RADIUS_1)
+        return self._rays_from_bundle(start_x, y_starts, angle_rad, bundle, wavelength_mm)
+    
+    def trace_parallel_rays_multi(self, num_rays: int = DEFAULT_NUM_RAYS,
+                                  wavelengths_mm: Sequence[float] = (WAVELENGTH_GREEN * NM_TO_MM,),
+                                  ray_height_range: Optional[Tuple[float, float]] = None,
+                                  angle_deg: float = 0.0) -> List[List[Ray]]:
+        """
+        Trace a collimated beam at several wavelengths.
+        
+        The tracer's refractive index does not depend on wavelength, so the
+        beam is traced once and shared by all wavelengths.
+        
+        Returns:
+            One list of rays per wavelength, as from trace_parallel_rays
+        """
+        if refract_bundle is None:
+            return [self.trace_parallel_rays(num_rays, ray_height_range, wavelength_mm, angle_deg)
+                    for wavelength_mm in wavelengths_mm]
+        
+        start_x, y_starts, angle_rad = self._parallel_ray_starts(
+            num_rays, ray_height_range, angle_deg)
+        bundle = self._trace_parallel_bundle(start_x, y_starts, angle_rad, DEFAULT_RADIUS_1)
+        return [self._rays_from_bundle(start_x, y_starts, angle_rad, bundle, wavelength_mm)
+                for wavelength_mm in wavelengths_mm]
+    
+    def _rays_from_bundle(self, start_x: float, y_starts: Any, angle_rad: float,
+                          bundle: Tuple[Any, Any, Any, Any, Any],
+                          wavelength_mm: float) -> List[Ray]:
+        """Wrap a _trace_parallel_bundle result into Ray objects."""
+        xs, ys, angles, paths, alive = bundle
+        
+        # Rays stopped in the bundle (misses, TIR, side exits) are retraced
+        # one by one to keep their exact paths
+        rays = []
+        for i, y_start in enumerate(y_starts.tolist()):
+            ray = Ray(start_x, y_start, angle_rad, wavelength_mm=wavelength_mm, dtype=self.dtype)
+            if alive[i]:
+                ray._extend_path(paths[i, 1:])
+                ray.x, ray.y, ray.angle_rad = float(xs[i]), float(ys[i]), float(angles[i])
+                ray.n = REFRACTIVE_INDEX_AIR
+            else:
+                self.trace_ray(ray)
             rays.append(ray)
         
         return rays
@@ -630,32 +971,62 @@ class LensRayTracer:
                                num_rays: int = DEFAULT_NUM_RAYS, max_angle_deg: float = DEFAULT_ANGLE_RANGE[1], 
                                wavelength_mm: float = WAVELENGTH_GREEN * NM_TO_MM) -> List[Ray]:
         """Trace rays from a point source."""
-        rays = []
         max_angle_rad = math.radians(max_angle_deg)
         
+        if _trace_lens_rays is not None and num_rays > 1:
+            # Pack the fan straight into the batch kernel's arrays; all rays
+            # share the source point
+            angles = -max_angle_rad + 2 * max_angle_rad * np.arange(num_rays) / (num_rays - 1)
+            rays = [Ray(source_x, source_y, angle, wavelength_mm=wavelength_mm, dtype=self.dtype)
+                    for angle in angles.tolist()]
+            points = np.empty((num_rays, 4, 2))
+            points[:, 0] = np.array((source_x, source_y), dtype=self.dtype)
+            return self._trace_ray_arrays(
+                rays, np.full(num_rays, float(source_x)), np.full(num_rays, float(source_y)),
+                angles, np.full(num_rays, REFRACTIVE_INDEX_AIR),
+                np.full(num_rays, self.dtype == np.float32), points, DEFAULT_RADIUS_1)
+        
+        rays = []
         for i in range(num_rays):
             if num_rays == 1:
                 angle = 0
             else:
                 angle = -max_angle_rad + 2 * max_angle_rad * i / (num_rays - 1)
             
-            ray = Ray(source_x, source_y, angle, wavelength_mm=wavelength_mm)
-            self.trace_ray(ray)
-            rays.append(ray)
+            rays.append(Ray(source_x, source_y, angle, wavelength_mm=wavelength_mm,
+                            dtype=self.dtype))
         
-        return rays
+        return self.trace_rays(rays)
     
     def find_focal_point(self, rays: List[Ray]) -> Optional[Tuple[float, float]]:
         """Find the focal point from a set of traced parallel rays."""
+        if np is not None:
+            # Last segment of every ray as one (N, 2, 2) array, in double precision
+            segments = [ray._path[ray.n_points - 2:ray.n_points] for ray in rays
+                        if ray.n_points >= 2]
+            if not segments:
+                return None
+            segments = np.array(segments, dtype=np.float64)
+            x1, y1 = segments[:, 0, 0], segments[:, 0, 1]
+            x2, y2 = segments[:, 1, 0], segments[:, 1, 1]
+            
+            # Segments crossing y=0, interpolated to their crossing
+            crosses = (y1 * y2 <= 0) & (np.abs(y2 - y1) > 1e-6)
+            x1, y1, x2, y2 = x1[crosses], y1[crosses], x2[crosses], y2[crosses]
+            crossings = (x1 + -y1 / (y2 - y1) * (x2 - x1)).tolist()
+            if not crossings:
+                return None
+            return (sum(crossings) / len(crossings), 0)
+        
         crossings = []
         
         for ray in rays:
-            if len(ray.path) < 2:
+            if ray.n_points < 2:
                 continue
             
-            # Check last segment of ray
-            x1, y1 = ray.path[-2]
-            x2, y2 = ray.path[-1]
+            # Check last segment of ray (in double precision)
+            x1, y1 = float(ray.path[-2][0]), float(ray.path[-2][1])
+            x2, y2 = float(ray.path[-1][0]), float(ray.path[-1][1])
             
             # Check if ray crosses y=0
             if (y1 * y2 <= 0) and abs(y2 - y1) > 1e-6:
@@ -674,6 +1045,18 @@ class LensRayTracer:
     
     def get_lens_outline(self, num_points: int = MESH_RESOLUTION_HIGH) -> List[Tuple[float, float]]:
         """Get points defining the lens outline for visualization."""
+        if np is not None:
+            # Both arcs as whole-array sweeps over the same heights
+            y_max = self.D / 2
+            y_values = y_max - 2 * y_max * np.arange(num_points) / (num_points - 1)
+            front_x, front_y = self._outline_arc(y_values, self.front_is_flat,
+                                                 self.lens_offset, self.R1)
+            # The back surface sag has the opposite sign convention to the front
+            back_x, back_y = self._outline_arc(y_values[::-1], self.back_is_flat,
+                                               self.lens_offset + self.d, -self.R2)
+            return list(zip(np.concatenate((front_x, back_x)).tolist(),
+                            np.concatenate((front_y, back_y)).tolist()))
+        
         points = []
         
         # Front surface
@@ -718,6 +1101,23 @@ class LensRayTracer:
             points.append((x, y))
         
         return points
+    
+    @staticmethod
+    def _outline_arc(y: Any, is_flat: bool, base_x: float, R: float) -> Tuple[Any, Any]:
+        """
+        Sample one surface of the outline at heights y (numpy arrays).
+        
+        x = base_x - |R| + sqrt(R^2 - y^2) for R > 0, else
+        x = base_x + |R| - sqrt(R^2 - y^2); heights beyond |R| are dropped.
+        """
+        if is_flat:
+            return np.full_like(y, base_x), y
+        
+        R_abs = abs(R)
+        y = y[y * y <= R_abs * R_abs]
+        sag = np.sqrt(R_abs * R_abs - y * y)
+        x = base_x - R_abs + sag if R > 0 else base_x + R_abs - sag
+        return x, y
 
 
 class SystemRayTracer:
@@ -745,6 +1145,10 @@ class SystemRayTracer:
         first_pos = self.system.elements[0].position
         start_x = first_pos - 100.0
         
+        # The system does not change during the trace, so every ray shares
+        # one tracer per element
+        tracers = self._element_tracers()
+        
         for i in range(num_rays):
             if num_rays == 1:
                 height = 0
@@ -757,7 +1161,7 @@ class SystemRayTracer:
             ray = Ray(start_x, y_start, angle_rad, wavelength_mm=wavelength_mm)
             
             # Trace through system
-            self._trace_ray_through_system(ray)
+            self._trace_ray_through_system(ray, tracers)
             
             rays.append(ray)
         
@@ -768,21 +1172,32 @@ class SystemRayTracer:
         self._trace_ray_through_system(ray)
         return ray
 
-    def _trace_ray_through_system(self, ray: Ray) -> None:
-        """Trace a single ray through all elements"""
+    def _element_tracers(self) -> List[LensRayTracer]:
+        """A tracer for each element of the system, at its position"""
+        return [LensRayTracer(element.lens, x_offset=element.position)
+                for element in self.system.elements]
+
+    def _trace_ray_through_system(self, ray: Ray,
+                                  tracers: Optional[List[LensRayTracer]] = None) -> None:
+        """
+        Trace a single ray through all elements.
+        
+        Args:
+            ray: Ray to trace, updated in place
+            tracers: Tracers from _element_tracers to reuse; built if omitted
+        """
+        if tracers is None:
+            tracers = self._element_tracers()
         
-        for i, element in enumerate(self.system.elements):
+        for i, lens_tracer in enumerate(tracers):
             # Record current state
-            path_len_before = len(ray.path)
-            
-            # Create a tracer for this specific element at its position
-            lens_tracer = LensRayTracer(element.lens, x_offset=element.position)
+            path_len_before = ray.n_points
             
             # Trace through this lens
             lens_tracer.trace_ray(ray, propagate_distance=0)
             
             # Check if we hit the lens
-            hit_lens = len(ray.path) > path_len_before
+            hit_lens = ray.n_points > path_len_before
             
             if not hit_lens:
                 # We missed this lens. Reset termination.
@@ -5,158 +5,100 @@ Run all functional tests for openlens application
 
 import sys
 import os
+import importlib
+import traceback
 import unittest
 
 # Add project directory to path
 project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_dir)
 
-print("=" * 70)
-print("openlens - Complete Test Suite")
-print("=" * 70)
-print()
-
-# Run core tests
-print("\n" + "=" * 70)
-print("PHASE 1: Core Functionality Tests")
-print("=" * 70)
-
-try:
-    from test_lens_editor import run_tests
-    result1 = run_tests()
-    core_passed = result1.wasSuccessful()
-except Exception as e:
-    print(f"Error running core tests: {e}")
-    core_passed = False
-
-# Run System Tracer tests
-print("\n" + "=" * 70)
-print("PHASE 1.5: System Tracer Tests")
-print("=" * 70)
-
-try:
-    import unittest
-    import test_system_tracer
-    loader = unittest.TestLoader()
-    suite = loader.loadTestsFromModule(test_system_tracer)
-    runner = unittest.TextTestRunner(verbosity=2)
-    result_sys = runner.run(suite)
-    sys_passed = result_sys.wasSuccessful()
-except Exception as e:
-    print(f"Error running system tracer tests: {e}")
-    import traceback
-    traceback.print_exc()
-    sys_passed = False
-
-# Run 3D Ray Tracer tests
-print("\n" + "=" * 70)
-print("PHASE 1.6: 3D Ray Tracer Tests")
-print("=" * 70)
-
-try:
-    import test_ray_tracer_3d
-    loader = unittest.TestLoader()
-    suite = loader.loadTestsFromModule(test_ray_tracer_3d)
-    runner = unittest.TextTestRunner(verbosity=2)
-    result_3d = runner.run(suite)
-    r3d_passed = result_3d.wasSuccessful()
-except Exception as e:
-    print(f"Error running 3D ray tracer tests: {e}")
-    import traceback
-    traceback.print_exc()
-    r3d_passed = False
-
-# Run Analysis & Tolerancing tests
-print("\n" + "=" * 70)
-print("PHASE 1.7: Analysis & Tolerancing Tests")
-print("=" * 70)
-
-try:
-    import test_analysis
-    import test_tolerancing
-    import test_environmental
-    import test_spot_diagram_chromatic
-    import test_polarization_ray_tracing
-    import test_material_cache
-    
-    loader = unittest.TestLoader()
+RULE = "=" * 70
+
+# One loader for every phase; the runner reports failures in full but only
+# a dot per passing test, and buffer=True holds back output of passing tests
+_LOADER = unittest.TestLoader()
+
+
+def write_banner(title, prefix="\n", suffix=""):
+    """Write a section banner in one call, flushed so it precedes test output on stderr"""
+    sys.stdout.write(f"{prefix}{RULE}\n{title}\n{RULE}\n{suffix}")
+    sys.stdout.flush()
+
+
+def run_module_tests(*module_names):
+    """Run every test in the named test modules and return success"""
     suite = unittest.TestSuite()
-    suite.addTests(loader.loadTestsFromModule(test_analysis))
-    suite.addTests(loader.loadTestsFromModule(test_tolerancing))
-    suite.addTests(loader.loadTestsFromModule(test_environmental))
-    suite.addTests(loader.loadTestsFromModule(test_spot_diagram_chromatic))
-    suite.addTests(loader.loadTestsFromModule(test_polarization_ray_tracing))
-    suite.addTests(loader.loadTestsFromModule(test_material_cache))
-    
-    runner = unittest.TextTestRunner(verbosity=2)
-    result_analysis = runner.run(suite)
-    analysis_passed = result_analysis.wasSuccessful()
-except Exception as e:
-    print(f"Error running analysis tests: {e}")
-    import traceback
-    traceback.print_exc()
-    analysis_passed = False
-
-# Run GUI tests
-print("\n" + "=" * 70)
-print("PHASE 2: GUI Functionality Tests")
-print("=" * 70)
-
-try:
+    for name in module_names:
+        suite.addTests(_LOADER.loadTestsFromModule(importlib.import_module(name)))
+    runner = unittest.TextTestRunner(verbosity=1, stream=sys.stdout, buffer=True)
+    return runner.run(suite).wasSuccessful()
+
+
+def run_gui_phase():
     os.environ['OPENLENS_TESTING'] = '1'
-    from test_gui import run_gui_tests
-    result2 = run_gui_tests()
-    gui_passed = result2.wasSuccessful()
-except Exception as e:
-    print(f"Error running GUI tests: {e}")
-    gui_passed = False
-
-# Run Export tests
-print("\n" + "=" * 70)
-print("PHASE 4: Export Functionality Tests")
-print("=" * 70)
-
-try:
-    import test_stl_export
-    import test_drawing_export
-    import test_step_export
-    
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-    suite.addTests(loader.loadTestsFromModule(test_stl_export))
-    suite.addTests(loader.loadTestsFromModule(test_drawing_export))
-    suite.addTests(loader.loadTestsFromModule(test_step_export))
-    
-    runner = unittest.TextTestRunner(verbosity=2)
-    result_export = runner.run(suite)
-    export_passed = result_export.wasSuccessful()
-except Exception as e:
-    print(f"Error running export tests: {e}")
-    import traceback
-    traceback.print_exc()
-    export_passed = False
-
-# Summary
-print("\n" + "=" * 70)
-print("TEST SUITE SUMMARY")
-print("=" * 70)
-
-if core_passed and sys_passed and r3d_passed and analysis_passed and gui_passed and export_passed:
-    print("\n✓✓✓ ALL TESTS PASSED! ✓✓✓")
-    print("\nThe openlens application is working correctly!")
-    sys.exit(0)
-else:
-    print("\n✗✗✗ SOME TESTS FAILED ✗✗✗")
-    if not core_passed:
-        print("  - Core functionality tests failed")
-    if not sys_passed:
-        print("  - System tracer tests failed")
-    if not r3d_passed:
-        print("  - 3D ray tracer tests failed")
-    if not analysis_passed:
-        print("  - Analysis & Tolerancing tests failed")
-    if not gui_passed:
-        print("  - GUI functionality tests failed")
-    if not export_passed:
-        print("  - Export functionality tests failed")
-    sys.exit(1)
+    return run_module_tests('test_gui')
+
+
+# (banner, name, runner, required). Phases run in order; when a required
+# phase cannot run at all (e.g. the core modules fail to import) the later
+# phases would only fail the same way, so they are skipped.
+PHASES = [
+    ("PHASE 1: Core Functionality Tests", "Core functionality",
+     lambda: run_module_tests('test_lens_editor'), True),
+    ("PHASE 1.5: System Tracer Tests", "System tracer",
+     lambda: run_module_tests('test_system_tracer'), False),
+    ("PHASE 1.6: 3D Ray Tracer Tests", "3D ray tracer",
+     lambda: run_module_tests('test_ray_tracer_3d'), False),
+    ("PHASE 1.7: Analysis & Tolerancing Tests", "Analysis & Tolerancing",
+     lambda: run_module_tests('test_analysis',
+                              'test_tolerancing',
+                              'test_environmental',
+                              'test_spot_diagram_chromatic',
+                              'test_polarization_ray_tracing',
+                              'test_material_cache'), False),
+    ("PHASE 2: GUI Functionality Tests", "GUI functionality",
+     run_gui_phase, False),
+    ("PHASE 4: Export Functionality Tests", "Export functionality",
+     lambda: run_module_tests('test_stl_export',
+                              'test_drawing_export',
+                              'test_step_export'), False),
+]
+
+
+def main():
+    write_banner("openlens - Complete Test Suite", prefix="", suffix="\n")
+
+    results = {}
+    for banner, name, run_phase, required in PHASES:
+        write_banner(banner)
+
+        try:
+            results[name] = run_phase()
+        except Exception as e:
+            print(f"Error running {name.lower()} tests: {e}")
+            traceback.print_exc()
+            results[name] = False
+            if required:
+                print(f"\n{name} tests could not run; skipping remaining phases")
+                break
+
+    # Summary
+    passed = len(results) == len(PHASES) and all(results.values())
+    if passed:
+        summary = ("\n✓✓✓ ALL TESTS PASSED! ✓✓✓\n"
+                   "\nThe openlens application is working correctly!\n")
+    else:
+        lines = ["\n✗✗✗ SOME TESTS FAILED ✗✗✗"]
+        for _, name, _, _ in PHASES:
+            if name not in results:
+                lines.append(f"  - {name} tests skipped")
+            elif not results[name]:
+                lines.append(f"  - {name} tests failed")
+        summary = "\n".join(lines) + "\n"
+    write_banner("TEST SUITE SUMMARY", suffix=summary)
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
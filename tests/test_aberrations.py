@@ -191,6 +191,23 @@ class TestAberrationsCalculator(unittest.TestCase):
         
         self.assertGreater(ast_10deg, ast_5deg)
     
+    def test_field_independent_results_cached_until_lens_changes(self):
+        """Test that repeated calls reuse cached values but see lens edits"""
+        calc = AberrationsCalculator(self.biconvex)
+        first = calc.calculate_all_aberrations(field_angle=5.0)
+        base = calc._base
+        second = calc.calculate_all_aberrations(field_angle=10.0)
+        
+        self.assertIs(calc._base, base)
+        self.assertEqual(first['spherical'], second['spherical'])
+        self.assertGreater(abs(second['astigmatism']), abs(first['astigmatism']))
+        
+        self.biconvex.radius_of_curvature_1 = 60.0
+        changed = calc.calculate_all_aberrations(field_angle=5.0)
+        self.assertIsNot(calc._base, base)
+        self.assertAlmostEqual(changed['focal_length'], self.biconvex.calculate_focal_length())
+        self.assertEqual(calc.R1, 60.0)
+    
     def test_field_curvature_calculation(self):
         """Test field curvature (Petzval) calculation"""
         calc = AberrationsCalculator(self.biconvex)
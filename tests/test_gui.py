@@ -7,31 +7,42 @@ import unittest
 import sys
 import os
 import tempfile
-from PySide6.QtWidgets import QApplication
-from PySide6.QtTest import QTest
-from PySide6.QtCore import Qt
+import importlib.util
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from openlens import OpenLensWindow
 from src.lens import Lens
 from src.optical_system import OpticalSystem
 
-# Ensure a QApplication instance exists
-app = QApplication.instance()
-if not app:
-    app = QApplication(sys.argv)
+# Checked without importing them: the application pulls in Qt and matplotlib,
+# which collection should not pay for when these tests are skipped
+GUI_AVAILABLE = all(importlib.util.find_spec(name) is not None
+                    for name in ('PySide6', 'matplotlib'))
 
+
+@unittest.skipIf(not GUI_AVAILABLE, "PySide6 and matplotlib required for GUI tests")
 class TestOpenLensGUI(unittest.TestCase):
     """Test cases for the PySide6 OpenLens GUI"""
 
+    @classmethod
+    def setUpClass(cls):
+        from PySide6.QtWidgets import QApplication
+        from openlens import OpenLensWindow
+        
+        # Ensure a QApplication instance exists
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+        cls.window_class = OpenLensWindow
+
     def setUp(self):
         """Set up test fixtures"""
+        # A window per test, though building it is most of each test's time:
+        # the tests change its lens/assembly state, and its library load is
+        # deferred to the event loop, so a shared window leaks that state
         self.temp_db = tempfile.NamedTemporaryFile(suffix='.db', delete=False).name
         # Override DB path for testing
         # We'll initialize the window with no specific action to test defaults
-        self.window = OpenLensWindow()
+        self.window = self.window_class()
         self.window._db_path = self.temp_db
         self.window.show()
 
@@ -93,7 +104,7 @@ class TestOpenLensGUI(unittest.TestCase):
     def test_simulation_run(self):
         """Test running a simulation updates the viz widget"""
         self.window._editor_tabs.setCurrentIndex(2) # Simulation tab
-        QApplication.processEvents()
+        self.app.processEvents()
         
         viz = self.window._sim_tab._sim_viz
         # Force a simulation run with direct params if the UI bound one is failing in headless
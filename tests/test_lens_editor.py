@@ -121,6 +121,24 @@ class TestLens(unittest.TestCase):
         # Should be approximately 193.5mm for plano-convex
         self.assertGreater(focal_length, 0)
     
+    def test_focal_length_plano_kind_tracks_radius_changes(self):
+        """Test the plano fast path matches the full lensmaker's equation"""
+        lens = Lens(
+            radius_of_curvature_1=float('inf'),
+            radius_of_curvature_2=-100.0,
+            thickness=5.0,
+            refractive_index=1.5168
+        )
+        self.assertAlmostEqual(lens.calculate_focal_length(), 100.0 / 0.5168, places=6)
+        
+        # Curving the flat surface switches back to the general kernel
+        lens.radius_of_curvature_1 = 100.0
+        self.assertAlmostEqual(lens.calculate_focal_length(), 97.58, places=1)
+        
+        lens.radius_of_curvature_1 = float('inf')
+        lens.radius_of_curvature_2 = float('inf')
+        self.assertIsNone(lens.calculate_focal_length())
+    
     def test_focal_length_with_zero_radius(self):
         """Test focal length returns valid value when radius is 0 (converted to infinity)"""
         lens = Lens(
@@ -142,6 +160,30 @@ class TestLens(unittest.TestCase):
         focal_length = lens.calculate_focal_length()
         self.assertIsNone(focal_length)
     
+    def test_focal_length_memo_tracks_mutation(self):
+        """Test that the memoized focal length follows thickness and index changes"""
+        lens = Lens(radius_of_curvature_1=100.0, radius_of_curvature_2=-100.0,
+                    thickness=5.0, refractive_index=1.5168)
+        f = lens.calculate_focal_length()
+        self.assertEqual(lens.calculate_focal_length(), f)
+        
+        lens.refractive_index = 1.7
+        f_index = lens.calculate_focal_length()
+        self.assertLess(f_index, f)
+        
+        lens.thickness = 20.0
+        self.assertNotEqual(lens.calculate_focal_length(), f_index)
+    
+    def test_lens_uses_slots(self):
+        """Test that Lens stores attributes in slots and still copies cleanly"""
+        import copy
+        lens = Lens(name="Slotted", radius_of_curvature_1=80.0, radius_of_curvature_2=float('inf'))
+        self.assertFalse(hasattr(lens, '__dict__'))
+        
+        clone = copy.deepcopy(lens)
+        self.assertEqual(clone.to_dict(), lens.to_dict())
+        self.assertAlmostEqual(clone.calculate_focal_length(), lens.calculate_focal_length())
+    
     def test_lens_string_representation(self):
         """Test lens string representation"""
         lens = Lens(name="Test Lens")
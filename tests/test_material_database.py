@@ -252,6 +252,11 @@ class TestMaterialDatabaseExtended(unittest.TestCase):
         self.assertAlmostEqual(mat.nd, 1.6, places=3)
         self.assertEqual(mat.catalog, "Custom")
         
+    def test_import_missing_catalog(self):
+        missing = os.path.join(self.test_data_dir, 'no_such_catalog')
+        self.assertEqual(self.db.import_agf_catalog(missing + '.agf'), 0)
+        self.assertEqual(self.db.import_csv_catalog(missing + '.csv'), 0)
+        
     def test_internal_transmission_scaling(self):
         # Create a material with known transmission at 10mm
         # T = 0.5 at 10mm -> T = 0.5^(20/10) = 0.25 at 20mm
@@ -315,6 +315,34 @@ class TestDoubletOptimizer(unittest.TestCase):
         self.assertIsNotNone(result.optimized_system)
         self.assertEqual(len(result.optimized_system.elements), 2)
 
+    def test_doublet_fast_path_matches_generic(self):
+        """Test that the specialized doublet fast path matches the generic merit"""
+        doublet = create_doublet(focal_length=100, diameter=50)
+        optimizer = create_doublet_optimizer(doublet, target_focal_length=100.0)
+        values = [v.current_value + 5.0 for v in optimizer.variables]
+
+        fast_merit = optimizer._evaluate_design(values)
+
+        generic = LensOptimizer(doublet, optimizer.variables, optimizer.targets)
+        generic_merit = generic._evaluate_design(values)
+
+        self.assertAlmostEqual(fast_merit, generic_merit, places=6)
+
+    def test_evaluate_design_restores_system(self):
+        """Test that merit evaluation leaves the optimizer's system unchanged"""
+        doublet = create_doublet(focal_length=100, diameter=50)
+        optimizer = create_doublet_optimizer(doublet, target_focal_length=100.0)
+        before = [(e.lens.radius_of_curvature_1, e.lens.radius_of_curvature_2, e.position)
+                  for e in doublet.elements]
+        f_before = doublet.get_system_focal_length()
+
+        optimizer._evaluate_design([v.current_value + 5.0 for v in optimizer.variables])
+
+        after = [(e.lens.radius_of_curvature_1, e.lens.radius_of_curvature_2, e.position)
+                 for e in doublet.elements]
+        self.assertEqual(before, after)
+        self.assertAlmostEqual(doublet.get_system_focal_length(), f_before, places=9)
+
 
 class TestOptimizationConvergence(unittest.TestCase):
     """Test optimization convergence behavior"""
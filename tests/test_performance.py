@@ -9,12 +9,14 @@ import time
 import sys
 import os
 
+import numpy as np
+
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
 
 from lens_editor import Lens
 from ray_tracer import LensRayTracer
-from aberrations import AberrationsCalculator, analyze_lens_quality
+from aberrations import AberrationsCalculator, analyze_lens_quality, analyze_lens_quality_batch
 
 
 class TestPerformance(unittest.TestCase):
@@ -43,6 +45,8 @@ class TestPerformance(unittest.TestCase):
     def test_focal_length_calculation_performance(self):
         """Test performance of focal length calculations"""
         lens = Lens(material="Custom")
+        # Untimed first call so a JIT compile or cache load is not measured
+        lens.calculate_focal_length()
         
         start_time = time.time()
         
@@ -58,6 +62,8 @@ class TestPerformance(unittest.TestCase):
         """Test performance of ray tracing"""
         lens = Lens(material="Custom")
         tracer = LensRayTracer(lens)
+        # Untimed first trace so a JIT compile or cache load is not measured
+        tracer.trace_parallel_rays(num_rays=10)
         
         start_time = time.time()
         
@@ -131,13 +137,12 @@ class TestStressTests(unittest.TestCase):
             )
             lenses.append(lens)
         
-        results = []
-        for lens in lenses:
-            quality = analyze_lens_quality(lens)
-            results.append(quality)
+        results = analyze_lens_quality_batch(lenses)
         
-        # Should analyze all lenses
+        # Should analyze all lenses, matching the serial analysis
         self.assertEqual(len(results), 50)
+        self.assertEqual(results[0]['quality_score'],
+                         analyze_lens_quality(lenses[0])['quality_score'])
         
         # All should have quality scores
         for result in results:
@@ -168,12 +173,18 @@ class TestStressTests(unittest.TestCase):
                 )
                 lenses.append(lens)
         
-        # Calculate properties for all
-        for lens in lenses:
-            focal_length = lens.calculate_focal_length()
-            # Just verify it completes
+        # Calculate properties for all in one vectorized pass
+        focal_lengths = Lens.calculate_focal_length_batch(
+            np.array([lens.radius_of_curvature_1 for lens in lenses]),
+            np.array([lens.radius_of_curvature_2 for lens in lenses]),
+            np.array([lens.thickness for lens in lenses]),
+            np.array([lens.refractive_index for lens in lenses]))
         
         self.assertEqual(len(lenses), 50)
+        self.assertEqual(focal_lengths.shape, (50,))
+        expected = [lens.calculate_focal_length() for lens in lenses]
+        expected = np.array([np.nan if f is None else f for f in expected])
+        self.assertTrue(np.allclose(focal_lengths, expected, equal_nan=True))
 
 
 class TestMemoryUsage(unittest.TestCase):
@@ -212,8 +223,10 @@ class TestMemoryUsage(unittest.TestCase):
         rays = tracer.trace_parallel_rays(num_rays=100)
         
         # Check that paths are stored
-        total_points = sum(len(ray.path) for ray in rays)
+        total_points = sum(ray.n_points for ray in rays)
         self.assertGreater(total_points, 0)
+        for ray in rays:
+            self.assertEqual(ray.path.shape, (ray.n_points, 2))
 
 
 class TestScalability(unittest.TestCase):
@@ -223,6 +236,8 @@ class TestScalability(unittest.TestCase):
         """Test performance scaling with number of rays"""
         lens = Lens(material="Custom")
         tracer = LensRayTracer(lens)
+        # Untimed first trace so the 10-ray baseline excludes one-off costs
+        tracer.trace_parallel_rays(num_rays=10)
         
         times = []
         ray_counts = [10, 50, 100, 500]
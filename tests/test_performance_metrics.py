@@ -7,11 +7,14 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+import logging
 import unittest
 from lens_editor import Lens
 from optical_system import OpticalSystem
 from performance_metrics import PerformanceMetrics
 
+log = logging.getLogger(__name__)
+
 
 class TestPerformanceMetrics(unittest.TestCase):
     """Test performance metrics calculations"""
@@ -36,7 +39,7 @@ class TestPerformanceMetrics(unittest.TestCase):
         
         self.assertIsNotNone(f_num)
         self.assertGreater(f_num, 0)
-        print(f"✓ F-number: f/{f_num:.2f}")
+        log.debug("✓ F-number: f/%.2f", f_num)
     
     def test_back_focal_length(self):
         """Test back focal length calculation"""
@@ -44,7 +47,7 @@ class TestPerformanceMetrics(unittest.TestCase):
         bfl = calc.calculate_back_focal_length()
         
         self.assertIsNotNone(bfl)
-        print(f"✓ Back focal length: {bfl:.3f} mm")
+        log.debug("✓ Back focal length: %.3f mm", bfl)
     
     def test_numerical_aperture(self):
         """Test numerical aperture calculation"""
@@ -54,7 +57,7 @@ class TestPerformanceMetrics(unittest.TestCase):
         self.assertIsNotNone(na)
         self.assertGreater(na, 0)
         self.assertLess(na, 1.0)
-        print(f"✓ Numerical aperture: {na:.4f}")
+        log.debug("✓ Numerical aperture: %.4f", na)
     
     def test_resolution_estimate(self):
         """Test resolution estimation"""
@@ -64,7 +67,7 @@ class TestPerformanceMetrics(unittest.TestCase):
         
         self.assertIsNotNone(resolution)
         self.assertGreater(resolution, 0)
-        print(f"✓ Resolution (Rayleigh): {resolution:.3f} μm")
+        log.debug("✓ Resolution (Rayleigh): %.3f μm", resolution)
     
     def test_mtf_cutoff(self):
         """Test MTF cutoff frequency"""
@@ -74,7 +77,7 @@ class TestPerformanceMetrics(unittest.TestCase):
         
         self.assertIsNotNone(mtf)
         self.assertGreater(mtf, 0)
-        print(f"✓ MTF cutoff: {mtf:.1f} lp/mm")
+        log.debug("✓ MTF cutoff: %.1f lp/mm", mtf)
     
     def test_airy_disk(self):
         """Test Airy disk radius calculation"""
@@ -85,7 +88,7 @@ class TestPerformanceMetrics(unittest.TestCase):
         self.assertGreater(airy_radius, 0)
         # Convert radius to diameter for display
         airy_diameter = airy_radius * 2 * 1000  # Convert mm to μm
-        print(f"✓ Airy disk diameter: {airy_diameter:.3f} μm")
+        log.debug("✓ Airy disk diameter: %.3f μm", airy_diameter)
     
     def test_depth_of_field(self):
         """Test depth of field calculation"""
@@ -104,7 +107,7 @@ class TestPerformanceMetrics(unittest.TestCase):
         
         self.assertIsNotNone(dof_near)
         self.assertGreater(dof_near, 0)
-        print(f"✓ Depth of field: {dof_near:.1f} mm to {dof_far if dof_far != float('inf') else '∞'}")
+        log.debug("✓ Depth of field: %.1f mm to %s", dof_near, dof_far if dof_far != float('inf') else '∞')
     
     def test_field_of_view(self):
         """Test field of view calculation"""
@@ -114,7 +117,7 @@ class TestPerformanceMetrics(unittest.TestCase):
         self.assertIsNotNone(fov)
         self.assertGreater(fov, 0)
         self.assertLess(fov, 180)
-        print(f"✓ Field of view: {fov:.2f}°")
+        log.debug("✓ Field of view: %.2f°", fov)
     
     def test_get_all_metrics(self):
         """Test getting all metrics at once"""
@@ -134,11 +137,26 @@ class TestPerformanceMetrics(unittest.TestCase):
         self.assertIn('mtf_cutoff_lpmm', metrics)
         self.assertIn('field_of_view_deg', metrics)
         
-        print(f"✓ All metrics calculated successfully")
-        print(f"  - Focal length: {metrics['effective_focal_length']:.2f} mm")
-        print(f"  - F-number: f/{metrics['f_number']:.2f}")
-        print(f"  - Resolution: {metrics['resolution_um']:.3f} μm")
-        print(f"  - Field of view: {metrics['field_of_view_deg']:.2f}°")
+        log.debug("✓ All metrics calculated successfully")
+        log.debug("  - Focal length: %.2f mm", metrics['effective_focal_length'])
+        log.debug("  - F-number: f/%.2f", metrics['f_number'])
+        log.debug("  - Resolution: %.3f μm", metrics['resolution_um'])
+        log.debug("  - Field of view: %.2f°", metrics['field_of_view_deg'])
+    
+    def test_invalidate_after_lens_change(self):
+        """Test that invalidate picks up changes to the lens"""
+        calc = PerformanceMetrics(self.lens)
+        f_num = calc.calculate_f_number()
+        
+        self.lens.radius_of_curvature_1 = 100.0
+        self.lens.radius_of_curvature_2 = -100.0
+        self.assertEqual(calc.calculate_f_number(), f_num)  # Cached EFL
+        
+        calc.invalidate()
+        self.assertAlmostEqual(calc.calculate_f_number(),
+                               self.lens.calculate_focal_length() / self.lens.diameter)
+        self.assertGreater(calc.calculate_f_number(), f_num)
+        log.debug("✓ F-number after invalidate: f/%.2f", calc.calculate_f_number())
     
     def test_format_metrics_report(self):
         """Test metrics report formatting"""
@@ -152,8 +170,8 @@ class TestPerformanceMetrics(unittest.TestCase):
         self.assertIn('F-Number', report)
         self.assertIn('Resolution', report)
         
-        print(f"✓ Metrics report formatted successfully")
-        print(report)
+        log.debug("✓ Metrics report formatted successfully")
+        log.debug("%s", report)
 
 
 class TestPerformanceMetricsWithSystem(unittest.TestCase):
@@ -177,7 +195,7 @@ class TestPerformanceMetricsWithSystem(unittest.TestCase):
         f_num = calc.calculate_f_number()
         
         self.assertIsNotNone(f_num)
-        print(f"✓ System F-number: f/{f_num:.2f}")
+        log.debug("✓ System F-number: f/%.2f", f_num)
 
 
 def run_tests():
@@ -201,5 +219,12 @@ def run_tests():
 
 
 if __name__ == '__main__':
-    success = run_tests()
-    sys.exit(0 if success else 1)
+    logging.basicConfig(level=logging.DEBUG, format='%(message)s')
+    # Run the test cases in parallel when pytest-xdist is available
+    try:
+        import pytest
+        import xdist  # noqa: F401
+    except ImportError:
+        success = run_tests()
+        sys.exit(0 if success else 1)
+    sys.exit(pytest.main(['-n', 'auto', __file__]))
@@ -5,8 +5,11 @@ Comprehensive functional tests for preset library and performance metrics
 
 import sys
 import os
+import copy
 import unittest
 
+import numpy as np
+
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
 
 from preset_library import PresetLibrary, LensPreset, get_preset_library
@@ -18,6 +21,11 @@ from optical_system import create_doublet
 class TestPresetLibrary(unittest.TestCase):
     """Test preset lens library"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Load the default presets once; read-only tests share this library"""
+        cls._ref_lib = PresetLibrary()
+    
     def test_create_library(self):
         """Test creating preset library"""
         lib = PresetLibrary()
@@ -28,6 +36,17 @@ class TestPresetLibrary(unittest.TestCase):
         lib = PresetLibrary()
         self.assertGreater(len(lib.presets), 0)
     
+    def test_libraries_do_not_share_lenses(self):
+        """Test that each library gets its own copies of the default lenses"""
+        lib1 = PresetLibrary()
+        lib2 = PresetLibrary()
+        lens1 = lib1.get_preset('50mm Biconvex').lens
+        lens2 = lib2.get_preset('50mm Biconvex').lens
+        
+        self.assertIsNot(lens1, lens2)
+        lens1.thickness = 9.0
+        self.assertEqual(lens2.thickness, 5.0)
+    
     def test_get_preset_library_singleton(self):
         """Test singleton pattern"""
         lib1 = get_preset_library()
@@ -36,7 +55,7 @@ class TestPresetLibrary(unittest.TestCase):
     
     def test_list_presets(self):
         """Test listing all presets"""
-        lib = PresetLibrary()
+        lib = self._ref_lib
         presets = lib.list_presets()
         
         self.assertIsInstance(presets, list)
@@ -45,7 +64,7 @@ class TestPresetLibrary(unittest.TestCase):
     
     def test_list_categories(self):
         """Test listing categories"""
-        lib = PresetLibrary()
+        lib = self._ref_lib
         categories = lib.list_categories()
         
         self.assertIsInstance(categories, list)
@@ -54,7 +73,7 @@ class TestPresetLibrary(unittest.TestCase):
     
     def test_list_presets_by_category(self):
         """Test filtering presets by category"""
-        lib = PresetLibrary()
+        lib = self._ref_lib
         simple_lenses = lib.list_presets(category='Simple Lenses')
         
         self.assertGreater(len(simple_lenses), 0)
@@ -63,7 +82,7 @@ class TestPresetLibrary(unittest.TestCase):
     
     def test_get_preset_by_name(self):
         """Test getting specific preset"""
-        lib = PresetLibrary()
+        lib = self._ref_lib
         preset = lib.get_preset('50mm Biconvex')
         
         self.assertIsNotNone(preset)
@@ -72,14 +91,14 @@ class TestPresetLibrary(unittest.TestCase):
     
     def test_get_nonexistent_preset(self):
         """Test getting preset that doesn't exist"""
-        lib = PresetLibrary()
+        lib = self._ref_lib
         preset = lib.get_preset('Nonexistent Lens')
         
         self.assertIsNone(preset)
     
     def test_search_presets(self):
         """Test searching presets"""
-        lib = PresetLibrary()
+        lib = self._ref_lib
         results = lib.search_presets('biconvex')
         
         self.assertGreater(len(results), 0)
@@ -89,7 +108,7 @@ class TestPresetLibrary(unittest.TestCase):
     
     def test_search_case_insensitive(self):
         """Test search is case-insensitive"""
-        lib = PresetLibrary()
+        lib = self._ref_lib
         results1 = lib.search_presets('BICONVEX')
         results2 = lib.search_presets('biconvex')
         
@@ -97,7 +116,7 @@ class TestPresetLibrary(unittest.TestCase):
     
     def test_add_custom_preset(self):
         """Test adding custom preset"""
-        lib = PresetLibrary()
+        lib = copy.deepcopy(self._ref_lib)  # Mutated below
         initial_count = len(lib.presets)
         
         lens = Lens(name="Custom", radius_of_curvature_1=100,
@@ -114,9 +133,29 @@ class TestPresetLibrary(unittest.TestCase):
         self.assertEqual(len(lib.presets), initial_count + 1)
         self.assertIsNotNone(lib.get_preset('Custom Lens'))
     
+    def test_add_preset_replaces_existing_name(self):
+        """Re-adding a name replaces the preset in listings and search"""
+        lib = copy.deepcopy(self._ref_lib)  # Mutated below
+        initial_count = len(lib.list_presets())
+        
+        lens = Lens(name="Replacement", radius_of_curvature_1=80,
+                   radius_of_curvature_2=-80, thickness=4, diameter=20)
+        lib.add_preset(LensPreset(
+            name="50mm Biconvex",
+            category="Custom",
+            description="Replacement preset",
+            lens=lens
+        ))
+        
+        self.assertEqual(len(lib.list_presets()), initial_count)
+        self.assertEqual([p.lens for p in lib.list_presets('Custom')], [lens])
+        self.assertIn('Custom', lib.list_categories())
+        self.assertEqual([p.name for p in lib.search_presets('replacement')],
+                         ['50mm Biconvex'])
+    
     def test_get_lens_copy(self):
         """Test getting lens copy from preset"""
-        lib = PresetLibrary()
+        lib = self._ref_lib
         lens_copy = lib.get_lens_copy('50mm Biconvex')
         
         self.assertIsNotNone(lens_copy)
@@ -125,10 +164,17 @@ class TestPresetLibrary(unittest.TestCase):
         # Should be a new object
         original_preset = lib.get_preset('50mm Biconvex')
         self.assertIsNot(lens_copy, original_preset.lens)
+        self.assertNotEqual(lens_copy.id, original_preset.lens.id)
+        self.assertEqual(lens_copy.calculate_focal_length(),
+                         original_preset.lens.calculate_focal_length())
+        
+        # Editing the copy must not touch the preset
+        lens_copy.radius_of_curvature_1 = 80.0
+        self.assertEqual(original_preset.lens.radius_of_curvature_1, 51.5)
     
     def test_preset_has_all_fields(self):
         """Test that preset has all expected fields"""
-        lib = PresetLibrary()
+        lib = self._ref_lib
         preset = lib.get_preset('50mm Biconvex')
         
         self.assertIsNotNone(preset.name)
@@ -138,7 +184,7 @@ class TestPresetLibrary(unittest.TestCase):
     
     def test_preset_lens_is_valid(self):
         """Test that preset lens has valid parameters"""
-        lib = PresetLibrary()
+        lib = self._ref_lib
         preset = lib.get_preset('50mm Biconvex')
         lens = preset.lens
         
@@ -154,15 +200,20 @@ class TestPresetLibrary(unittest.TestCase):
 class TestPerformanceMetrics(unittest.TestCase):
     """Test performance metrics calculator"""
     
-    def setUp(self):
-        """Create test lens"""
-        self.lens = Lens(
+    @classmethod
+    def setUpClass(cls):
+        """Create the test lens once"""
+        cls._template_lens = Lens(
             radius_of_curvature_1=50,
             radius_of_curvature_2=-50,
             thickness=5,
             diameter=25.4
         )
     
+    def setUp(self):
+        """Give each test its own copy of the template lens"""
+        self.lens = copy.copy(self._template_lens)
+    
     def test_create_metrics_with_lens(self):
         """Test creating metrics with lens"""
         metrics = PerformanceMetrics(self.lens)
@@ -277,6 +328,11 @@ class TestPerformanceMetrics(unittest.TestCase):
         
         # Larger diameter should have smaller f-number
         self.assertGreater(f_num1, f_num2)
+        
+        # Same sweep through the batched API
+        f_nums = metrics1.calculate_f_number_batch(np.array([25.0, 50.0]))
+        self.assertTrue(np.all(np.diff(f_nums) < 0))
+        self.assertTrue(np.allclose(f_nums, [f_num1, f_num2]))
     
     def test_metrics_for_system(self):
         """Test metrics calculation for optical system"""
@@ -328,4 +384,10 @@ def run_tests():
 
 
 if __name__ == '__main__':
-    sys.exit(run_tests())
+    # Run the test cases in parallel when pytest-xdist is available
+    try:
+        import pytest
+        import xdist  # noqa: F401
+    except ImportError:
+        sys.exit(run_tests())
+    sys.exit(pytest.main(['-n', 'auto', __file__]))
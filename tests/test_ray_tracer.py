@@ -7,11 +7,20 @@ import unittest
 import sys
 import os
 import math
+import subprocess
+import tempfile
+from unittest import mock
+
+import numpy as np
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from lens_editor import Lens
-from ray_tracer import Ray, LensRayTracer
+import ray_tracer
+from ray_kernels import _refract_numpy
+from jit import HAS_NUMBA
+from ray_tracer import Ray, LensRayTracer, SystemRayTracer
+from optical_system import OpticalSystem
 
 
 class TestRay(unittest.TestCase):
@@ -24,7 +33,7 @@ class TestRay(unittest.TestCase):
         self.assertEqual(ray.y, 10)
         self.assertEqual(ray.angle_rad, 0.5)
         self.assertEqual(len(ray.path), 1)
-        self.assertEqual(ray.path[0], (0, 10))
+        self.assertEqual(tuple(ray.path[0]), (0, 10))
         self.assertFalse(ray.terminated)
     
     def test_ray_propagation(self):
@@ -36,6 +45,25 @@ class TestRay(unittest.TestCase):
         self.assertAlmostEqual(ray.y, 0.0, places=5)
         self.assertEqual(len(ray.path), 2)
     
+    def test_ray_path_grows_past_preallocated_size(self):
+        """Test that the path buffer grows beyond max_segments"""
+        ray = Ray(x=0, y=0, angle_rad=0, max_segments=2)
+        for _ in range(5):
+            ray.propagate(1.0)
+        
+        self.assertEqual(ray.n_points, 6)
+        self.assertEqual(len(ray.path), 6)
+        self.assertAlmostEqual(ray.path[-1][0], 5.0, places=5)
+    
+    def test_ray_extend_path_grows_buffer(self):
+        """Test that bulk path appends grow the buffer as needed"""
+        ray = Ray(x=0, y=0, angle_rad=0, max_segments=2)
+        ray._extend_path(np.array([[1.0, 0.5], [2.0, 1.0], [3.0, 1.5], [4.0, 2.0]]))
+        
+        self.assertEqual(ray.n_points, 5)
+        self.assertEqual(ray.path[0].tolist(), [0.0, 0.0])
+        self.assertEqual(ray.path[-1].tolist(), [4.0, 2.0])
+    
     def test_ray_propagation_angled(self):
         """Test ray propagation at an angle"""
         ray = Ray(x=0, y=0, angle_rad=math.pi/4)  # 45 degree angle
@@ -44,8 +72,7 @@ class TestRay(unittest.TestCase):
         expected_x = 10.0 * math.cos(math.pi/4)
         expected_y = 10.0 * math.sin(math.pi/4)
         
-        self.assertAlmostEqual(ray.x, expected_x, places=5)
-        self.assertAlmostEqual(ray.y, expected_y, places=5)
+        np.testing.assert_allclose([ray.x, ray.y], [expected_x, expected_y], rtol=0, atol=5e-6)
     
     def test_ray_refraction_normal_incidence(self):
         """Test refraction at normal incidence (no bending)"""
@@ -61,7 +88,7 @@ class TestRay(unittest.TestCase):
     
     def test_ray_refraction_snells_law(self):
         """Test that Snell's law is correctly applied"""
-        ray = Ray(x=0, y=0, angle_rad=math.radians(30))
+        ray = Ray(x=0, y=0, angle_rad=math.radians(30), dtype=np.float64)
         
         # Refraction from air (n=1) to glass (n=1.5)
         # Surface normal pointing up (90 degrees)
@@ -115,10 +142,11 @@ class TestRay(unittest.TestCase):
 class TestLensRayTracer(unittest.TestCase):
     """Test suite for LensRayTracer class"""
     
-    def setUp(self):
-        """Create test lenses"""
+    @classmethod
+    def setUpClass(cls):
+        """Create test lenses and their tracers once; no test mutates them"""
         # Standard biconvex lens
-        self.biconvex = Lens(
+        cls.biconvex = Lens(
             name="Biconvex",
             radius_of_curvature_1=100.0,
             radius_of_curvature_2=-100.0,
@@ -129,7 +157,7 @@ class TestLensRayTracer(unittest.TestCase):
         )
         
         # Plano-convex lens
-        self.plano_convex = Lens(
+        cls.plano_convex = Lens(
             name="Plano-Convex",
             radius_of_curvature_1=50.0,
             radius_of_curvature_2=10000.0,  # Nearly flat
@@ -140,7 +168,7 @@ class TestLensRayTracer(unittest.TestCase):
         )
         
         # Biconcave lens
-        self.biconcave = Lens(
+        cls.biconcave = Lens(
             name="Biconcave",
             radius_of_curvature_1=-100.0,
             radius_of_curvature_2=100.0,
@@ -149,6 +177,13 @@ class TestLensRayTracer(unittest.TestCase):
             refractive_index=1.5168,
             material="BK7"
         )
+        
+        cls.biconvex_tracer = LensRayTracer(cls.biconvex)
+        cls.plano_convex_tracer = LensRayTracer(cls.plano_convex)
+        cls.biconcave_tracer = LensRayTracer(cls.biconcave)
+        
+        # Scratch path buffer shared by the array trace tests
+        cls._scratch_paths = np.empty((64, 4, 2))
     
     def test_tracer_initialization(self):
         """Test that tracer initializes with lens parameters"""
@@ -162,7 +197,7 @@ class TestLensRayTracer(unittest.TestCase):
     
     def test_trace_parallel_rays_biconvex(self):
         """Test tracing parallel rays through biconvex lens"""
-        tracer = LensRayTracer(self.biconvex)
+        tracer = self.biconvex_tracer
         rays = tracer.trace_parallel_rays(num_rays=5)
         
         # Should have 5 rays
@@ -174,7 +209,7 @@ class TestLensRayTracer(unittest.TestCase):
     
     def test_trace_parallel_rays_with_angle(self):
         """Test tracing parallel rays at an angle"""
-        tracer = LensRayTracer(self.biconvex)
+        tracer = self.biconvex_tracer
         # Trace rays with 10 degree angle
         angle_deg = 10.0
         rays = tracer.trace_parallel_rays(num_rays=5, angle_deg=angle_deg)
@@ -198,7 +233,7 @@ class TestLensRayTracer(unittest.TestCase):
     
     def test_parallel_rays_converge(self):
         """Test that parallel rays through converging lens focus"""
-        tracer = LensRayTracer(self.biconvex)
+        tracer = self.biconvex_tracer
         rays = tracer.trace_parallel_rays(num_rays=10)
         
         focal_point = tracer.find_focal_point(rays)
@@ -207,10 +242,23 @@ class TestLensRayTracer(unittest.TestCase):
         self.assertGreater(len(rays), 0)
         for ray in rays:
             self.assertGreater(len(ray.path), 1)  # Ray should have at least initial and final points
+        
+        # Marginal rays focus short of the paraxial focus (spherical aberration)
+        focal_x, focal_y = focal_point
+        self.assertEqual(focal_y, 0)
+        back_focal_distance = focal_x - tracer.back_vertex_x
+        self.assertGreater(back_focal_distance, 0)
+        self.assertLess(back_focal_distance, self.biconvex.calculate_focal_length())
+    
+    def test_find_focal_point_without_crossings(self):
+        """Test that no focal point is found when no ray crosses the axis"""
+        tracer = self.biconcave_tracer
+        self.assertIsNone(tracer.find_focal_point([]))
+        self.assertIsNone(tracer.find_focal_point(tracer.trace_parallel_rays(num_rays=4)))
     
     def test_parallel_rays_diverge_biconcave(self):
         """Test that parallel rays through diverging lens spread out"""
-        tracer = LensRayTracer(self.biconcave)
+        tracer = self.biconcave_tracer
         rays = tracer.trace_parallel_rays(num_rays=5)
         
         # Check that rays were traced
@@ -226,14 +274,14 @@ class TestLensRayTracer(unittest.TestCase):
     
     def test_ray_at_different_heights(self):
         """Test rays at different heights behave differently"""
-        tracer = LensRayTracer(self.biconvex)
+        tracer = self.biconvex_tracer
         
         # On-axis ray
-        ray_center = Ray(-50, 0, angle_rad=0)
+        ray_center = Ray(-50, 0, angle_rad=0, dtype=np.float32)
         tracer.trace_ray(ray_center)
         
         # Off-axis ray
-        ray_edge = Ray(-50, 20, angle_rad=0)
+        ray_edge = Ray(-50, 20, angle_rad=0, dtype=np.float32)
         tracer.trace_ray(ray_edge)
         
         # Rays should have different final angles (spherical aberration)
@@ -241,7 +289,7 @@ class TestLensRayTracer(unittest.TestCase):
     
     def test_point_source_rays(self):
         """Test tracing rays from a point source"""
-        tracer = LensRayTracer(self.biconvex)
+        tracer = self.biconvex_tracer
         
         # Point source before lens
         rays = tracer.trace_point_source_rays(
@@ -254,27 +302,32 @@ class TestLensRayTracer(unittest.TestCase):
         self.assertEqual(len(rays), 7)
         
         # All rays should start at the source
-        for ray in rays:
-            self.assertEqual(ray.path[0], (-100, 0))
+        np.testing.assert_array_equal(np.stack([ray.path[0] for ray in rays]),
+                                      np.broadcast_to([-100, 0], (7, 2)))
+        
+        # The fan is traced as a batch but matches tracing each ray alone
+        for i, ray in enumerate(rays):
+            single = tracer.trace_ray(Ray(-100, 0, math.radians(-15.0 + 5.0 * i),
+                                          dtype=tracer.dtype))
+            np.testing.assert_allclose(ray.path, single.path, atol=1e-6)
     
     def test_lens_outline_generation(self):
         """Test that lens outline is generated correctly"""
-        tracer = LensRayTracer(self.biconvex)
+        tracer = self.biconvex_tracer
         outline = tracer.get_lens_outline(num_points=50)
         
         # Should have points
         self.assertGreater(len(outline), 0)
         
-        # Points should be (x, y) tuples
-        for point in outline:
-            self.assertEqual(len(point), 2)
-            x, y = point
-            # Y values should be within diameter
-            self.assertLessEqual(abs(y), self.biconvex.diameter / 2 + 0.1)
+        # Points should be (x, y) pairs
+        points = np.asarray(outline)
+        self.assertEqual(points.shape, (len(outline), 2))
+        # Y values should be within diameter
+        self.assertLessEqual(np.abs(points[:, 1]).max(), self.biconvex.diameter / 2 + 0.1)
     
     def test_plano_convex_lens(self):
         """Test ray tracing through plano-convex lens"""
-        tracer = LensRayTracer(self.plano_convex)
+        tracer = self.plano_convex_tracer
         rays = tracer.trace_parallel_rays(num_rays=5)
         
         # Should successfully trace rays
@@ -286,7 +339,7 @@ class TestLensRayTracer(unittest.TestCase):
     
     def test_ray_misses_lens(self):
         """Test behavior when ray misses the lens"""
-        tracer = LensRayTracer(self.biconvex)
+        tracer = self.biconvex_tracer
         
         # Ray well above the lens
         ray = Ray(x=-50, y=100, angle_rad=0)  # Way above lens diameter
@@ -297,11 +350,11 @@ class TestLensRayTracer(unittest.TestCase):
     
     def test_chromatic_dispersion(self):
         """Test that different wavelengths can be traced"""
-        tracer = LensRayTracer(self.biconvex)
+        tracer = self.biconvex_tracer
         
-        # Red and blue light (different wavelengths in mm)
-        rays_red = tracer.trace_parallel_rays(num_rays=3, wavelength_mm=0.000650)
-        rays_blue = tracer.trace_parallel_rays(num_rays=3, wavelength_mm=0.000450)
+        # Red and blue light (different wavelengths in mm), in one beam trace
+        rays_red, rays_blue = tracer.trace_parallel_rays_multi(
+            num_rays=3, wavelengths_mm=[0.000650, 0.000450])
         
         # Both should trace successfully
         self.assertEqual(len(rays_red), 3)
@@ -310,24 +363,147 @@ class TestLensRayTracer(unittest.TestCase):
         # Wavelengths should be stored
         self.assertAlmostEqual(rays_red[0].wavelength_mm, 0.000650, places=6)
         self.assertAlmostEqual(rays_blue[0].wavelength_mm, 0.000450, places=6)
+        
+        # Same paths as tracing each wavelength separately
+        rays_red_alone = tracer.trace_parallel_rays(num_rays=3, wavelength_mm=0.000650)
+        for ray_red, ray in zip(rays_red, rays_red_alone):
+            self.assertTrue(np.array_equal(ray_red.path, ray.path))
+    
+    def test_trace_batch_matches_trace_ray(self):
+        """Test that the batched bundle trace agrees with per-ray tracing"""
+        tracer = LensRayTracer(self.biconvex, dtype=np.float64)
+        heights = [-20.0, -5.0, 0.0, 5.0, 20.0]
+        
+        origins, dirs, alive = tracer._trace_batch(
+            [-100.0] * len(heights), heights, [0.02] * len(heights))
+        
+        for i, h in enumerate(heights):
+            ray = Ray(x=-100.0, y=h, angle_rad=0.02)
+            tracer.trace_ray(ray, propagate_distance=0)
+            self.assertTrue(alive[i])
+            self.assertAlmostEqual(origins[i][0], ray.x, places=6)
+            self.assertAlmostEqual(origins[i][1], ray.y, places=6)
+            self.assertAlmostEqual(math.atan2(dirs[i][1], dirs[i][0]), ray.angle, places=6)
+    
+    def test_trace_parallel_rays_soa(self):
+        """Test the array beam trace against the Ray objects built from it"""
+        tracer = LensRayTracer(self.biconvex, dtype=np.float64)
+        xs, ys, angles, paths, alive = tracer.trace_parallel_rays_soa(num_rays=9)
+        rays = tracer.trace_parallel_rays(num_rays=9)
+        
+        self.assertEqual(paths.shape, (9, 4, 2))
+        # The outermost rays meet the surfaces where they cross, past the
+        # edge thickness, and are left to the per-ray tracer
+        self.assertEqual(alive.tolist(), [False] + [True] * 7 + [False])
+        # Converging lens: every off-axis ray bends towards the axis
+        self.assertTrue(np.all(angles[1:4] > 0) and np.all(angles[5:8] < 0))
+        for i, ray in enumerate(rays):
+            if not alive[i]:
+                continue
+            self.assertTrue(np.allclose(ray.path, paths[i]))
+            self.assertAlmostEqual(ray.x, xs[i], places=9)
+            self.assertAlmostEqual(ray.y, ys[i], places=9)
+            self.assertAlmostEqual(ray.angle, angles[i], places=9)
+    
+    def test_trace_parallel_rays_soa_marks_stopped_rays(self):
+        """Test that rays outside the aperture are masked in the array trace"""
+        tracer = self.biconvex_tracer
+        _, _, _, paths, alive = tracer.trace_parallel_rays_soa(
+            num_rays=3, ray_height_range=(-40.0, 40.0), out=self._scratch_paths)
+        
+        self.assertTrue(np.shares_memory(paths, self._scratch_paths))
+        self.assertEqual(alive.tolist(), [False, True, False])
+        self.assertTrue(np.isnan(paths[0, 1:]).all())
+        self.assertFalse(np.isnan(paths[1]).any())
+    
+    @unittest.skipUnless(ray_tracer.HAS_NUMBA, "numba not installed")
+    def test_compiled_trace_ray_matches_python(self):
+        """Test that the compiled trace_ray kernel follows the Python tracer"""
+        # Hits, misses, side exits through a lens whose surfaces cross, and TIR
+        thin_edge = Lens(radius_of_curvature_1=20.0, radius_of_curvature_2=-20.0,
+                         thickness=2.0, diameter=39.0, refractive_index=2.0)
+        cases = [(lens, x, y, angle, dtype)
+                 for lens in (self.biconvex, self.plano_convex, self.biconcave, thin_edge)
+                 for x, y, angle in ((-100.0, 5.0, 0.0), (-100.0, 24.0, 0.05),
+                                     (0.0, 10.0, 0.3), (-50.0, -40.0, 0.0),
+                                     (-20.0, 18.0, -0.9))
+                 for dtype in (np.float32, np.float64)]
+        
+        for lens, x, y, angle, dtype in cases:
+            tracer = LensRayTracer(lens)
+            compiled = tracer.trace_ray(Ray(x, y, angle, dtype=dtype))
+            with mock.patch.object(ray_tracer, '_trace_lens_ray', None):
+                python = tracer.trace_ray(Ray(x, y, angle, dtype=dtype))
+            
+            with self.subTest(lens=lens.name, x=x, y=y, angle=angle, dtype=dtype):
+                self.assertEqual(compiled.n_points, python.n_points)
+                self.assertEqual(compiled.terminated, python.terminated)
+                self.assertEqual(compiled.n, python.n)
+                self.assertTrue(np.allclose(compiled.path, python.path, atol=1e-9))
+                self.assertAlmostEqual(compiled.angle, python.angle, places=12)
+    
+    def test_numpy_bundle_kernel_masks_tir_and_misses(self):
+        """Test that the NumPy bundle kernel stores only refracted lanes"""
+        angle = math.radians(60.0)  # Beyond the glass-air critical angle
+        origins = np.array([[-1.0, 0.0], [-1.0, 40.0], [-1.0, 0.0]])
+        dirs = np.array([[1.0, 0.0], [1.0, 0.0], [math.cos(angle), math.sin(angle)]])
+        start_dirs = dirs.copy()
+        alive = np.ones(3, dtype=np.bool_)
+        
+        # Flat surface at x=0, aperture 25 mm, glass (n=1.5) to air
+        _refract_numpy(origins, dirs, alive, 0.0, 0.0, 25.0, 1.5, 1.0)
+        
+        self.assertEqual(alive.tolist(), [True, False, False])
+        self.assertEqual(origins[0].tolist(), [0.0, 0.0])
+        self.assertEqual(origins[1].tolist(), [-1.0, 40.0])  # Miss: untouched
+        self.assertAlmostEqual(origins[2][0], 0.0)  # TIR: moved to the surface
+        self.assertTrue(np.array_equal(dirs[1:], start_dirs[1:]))
+        self.assertTrue(np.allclose(dirs[0], [1.0, 0.0]))
+    
+    def test_trace_rays_matches_trace_ray(self):
+        """Test that tracing a list of rays matches tracing them one by one"""
+        tracer = self.biconvex_tracer
+        starts = [(-100.0, 5.0, 0.0, np.float32), (-100.0, 100.0, 0.0, np.float64),
+                  (-20.0, 18.0, -0.9, np.float64), (-50.0, -10.0, 0.1, np.float32)]
+        
+        rays = tracer.trace_rays([Ray(x, y, a, dtype=d) for x, y, a, d in starts])
+        for ray, (x, y, a, d) in zip(rays, starts):
+            single = tracer.trace_ray(Ray(x, y, a, dtype=d))
+            self.assertEqual(ray.terminated, single.terminated)
+            self.assertEqual(ray.path.dtype, single.path.dtype)
+            self.assertTrue(np.array_equal(ray.path, single.path))
+            self.assertEqual((ray.x, ray.y, ray.angle, ray.n),
+                             (single.x, single.y, single.angle, single.n))
+    
+    def test_float32_paths_match_float64(self):
+        """Test that the default float32 path storage stays within display precision"""
+        rays32 = LensRayTracer(self.biconvex).trace_parallel_rays(num_rays=9)
+        rays64 = LensRayTracer(self.biconvex, dtype=np.float64).trace_parallel_rays(num_rays=9)
+        
+        for r32, r64 in zip(rays32, rays64):
+            self.assertEqual(r32.path.dtype, np.float32)
+            self.assertEqual(r32.n_points, r64.n_points)
+            self.assertTrue(np.allclose(r32.path, r64.path, atol=1e-4))
+            # Only the storage differs; the ray state is traced in float64
+            self.assertEqual((r32.x, r32.y, r32.angle_rad), (r64.x, r64.y, r64.angle_rad))
     
     def test_geometry_calculation(self):
         """Test lens geometry calculations"""
-        tracer = LensRayTracer(self.biconvex)
+        tracer = self.biconvex_tracer
         
         # Check that geometry is calculated (lens now starts at offset)
-        self.assertEqual(tracer.front_vertex_x, tracer.lens_offset)
-        self.assertEqual(tracer.back_vertex_x, tracer.lens_offset + self.biconvex.thickness)
+        np.testing.assert_array_equal(
+            [tracer.front_vertex_x, tracer.back_vertex_x],
+            [tracer.lens_offset, tracer.lens_offset + self.biconvex.thickness])
         
-        # Front surface center: For R1>0 (convex), center is to the RIGHT (standard sign convention)
-        # Center = Vertex + R
+        # Surface centers: Center = Vertex + R (standard sign convention), so
+        # the convex front (R1>0) centers to the RIGHT, the convex back
+        # (R2<0) to the LEFT
         expected_front_center = tracer.front_vertex_x + self.biconvex.radius_of_curvature_1
-        self.assertAlmostEqual(tracer.front_center_x, expected_front_center)
-        
-        # Back surface center: For R2<0 (convex), center is to the LEFT (standard sign convention)
-        # Center = Vertex + R
         expected_back_center = tracer.back_vertex_x + self.biconvex.radius_of_curvature_2
-        self.assertAlmostEqual(tracer.back_center_x, expected_back_center)
+        np.testing.assert_allclose([tracer.front_center_x, tracer.back_center_x],
+                                   [expected_front_center, expected_back_center],
+                                   rtol=0, atol=1e-9)
 
 
 class TestRayTracingPhysics(unittest.TestCase):
@@ -388,13 +564,57 @@ class TestRayTracingPhysics(unittest.TestCase):
             material="Glass"
         )
         
-        tracer = LensRayTracer(lens)
-        ray = Ray(x=-50, y=0, angle_rad=0)
+        tracer = LensRayTracer(lens, dtype=np.float32)
+        ray = Ray(x=-50, y=0, angle_rad=0, dtype=np.float32)
         tracer.trace_ray(ray)
         
         # All path points should have y ≈ 0
-        for x, y in ray.path:
-            self.assertAlmostEqual(y, 0, places=3)
+        np.testing.assert_allclose(ray.path[:, 1], 0.0, atol=5e-4)
+
+
+class TestSystemRayTracer(unittest.TestCase):
+    """Test suite for SystemRayTracer"""
+    
+    def test_parallel_rays_match_single_ray_traces(self):
+        """Test that the shared element tracers give the same paths as trace_ray"""
+        system = OpticalSystem()
+        system.add_lens(Lens(radius_of_curvature_1=100.0, radius_of_curvature_2=-100.0,
+                             thickness=5.0, diameter=50.0, refractive_index=1.5168))
+        system.add_lens(Lens(radius_of_curvature_1=60.0, radius_of_curvature_2=-80.0,
+                             thickness=4.0, diameter=40.0, refractive_index=1.6),
+                        air_gap_before=10.0)
+        tracer = SystemRayTracer(system)
+        
+        rays = tracer.trace_parallel_rays(num_rays=7)
+        
+        self.assertEqual(len(rays), 7)
+        for ray in rays:
+            single = tracer.trace_ray(Ray(ray.path[0][0], ray.path[0][1], 0.0))
+            self.assertTrue(np.array_equal(ray.path, single.path))
+            self.assertEqual(ray.terminated, single.terminated)
+
+
+class TestRayKernelsImport(unittest.TestCase):
+    """Test importing the kernels under both of their module names"""
+    
+    def test_package_import_after_flat_import(self):
+        """src.ray_tracer keeps its kernels when ray_tracer filled numba's cache"""
+        project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        flat = (f"import sys; sys.path.insert(0, {os.path.join(project_dir, 'src')!r}); "
+                "import ray_tracer")
+        package = (f"import sys; sys.path.insert(0, {project_dir!r}); "
+                   "import src.ray_tracer as rt; "
+                   "print(rt.refract_bundle is not None, rt._trace_lens_ray is not None)")
+        # Separate processes and a fresh cache, so the package import loads
+        # what the flat import compiled rather than reusing its module
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env = dict(os.environ, NUMBA_CACHE_DIR=cache_dir)
+            for code in (flat, package):
+                result = subprocess.run([sys.executable, "-c", code], cwd=cache_dir, env=env,
+                                        capture_output=True, text=True)
+                self.assertEqual(result.returncode, 0, result.stderr)
+        # The compiled kernels survive whenever numba is installed
+        self.assertEqual(result.stdout.split(), ["True", str(HAS_NUMBA)])
 
 
 if __name__ == '__main__':
@@ -1,72 +1,122 @@
 #!/usr/bin/env python3
 """Quick test of ray tracer"""
 
+import unittest
 import sys
-sys.path.insert(0, 'src')
+import os
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from lens_editor import Lens
-from ray_tracer import LensRayTracer, Ray
-
-print("Testing Ray Tracer")
-print("="*60)
-
-# Create a test lens
-lens = Lens(
-    name="Test Biconvex",
-    radius_of_curvature_1=100.0,
-    radius_of_curvature_2=-100.0,
-    thickness=5.0,
-    diameter=50.0,
-    refractive_index=1.5168,
-    lens_type="Biconvex",
-    material="BK7"
-)
-
-print(f"Lens: {lens.name}")
-print(f"Theoretical Focal Length: {lens.calculate_focal_length():.2f} mm")
-print()
-
-# Create ray tracer
-tracer = LensRayTracer(lens)
-
-print("Tracing parallel rays...")
-rays = tracer.trace_parallel_rays(num_rays=10)
-
-print(f"✓ Traced {len(rays)} rays")
-print(f"  Each ray has {len(rays[0].path)} path points")
-print()
-
-# Find focal point
-focal_point = tracer.find_focal_point(rays)
-
-if focal_point:
-    fx, fy = focal_point
-    bfd = fx - tracer.back_vertex_x
-    print(f"✓ Focal point found at ({fx:.2f}, {fy:.2f}) mm")
-    print(f"  Back focal distance: {bfd:.2f} mm")
+from ray_tracer import LensRayTracer
+
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), 'data', 'ray_tracer_quick_golden.npz')
+SNAPSHOT_FIELDS = ('xs', 'ys', 'angles', 'paths', 'alive')
+
+# (name, R1, R2, lens_type) of the standard test lenses
+LENS_CONFIGS = [
+    ("Test Biconvex", 100.0, -100.0, "Biconvex"),
+    ("Test Plano-Convex", 100.0, float('inf'), "Plano-Convex"),
+    ("Test Biconcave", -100.0, 100.0, "Biconcave"),
+]
+
+
+def make_lens(name, r1, r2, lens_type):
+    """Create one of the standard 50 mm BK7 test lenses"""
+    return Lens(
+        name=name,
+        radius_of_curvature_1=r1,
+        radius_of_curvature_2=r2,
+        thickness=5.0,
+        diameter=50.0,
+        refractive_index=1.5168,
+        lens_type=lens_type,
+        material="BK7"
+    )
+
+
+def trace_snapshot():
+    """
+    Collimated-beam traces of every standard lens, keyed '<lens index>_<field>'.
     
-    theoretical_f = lens.calculate_focal_length()
-    error = abs(bfd - theoretical_f) / theoretical_f * 100
-    print(f"  Error from theoretical: {error:.1f}%")
-else:
-    print("✗ No focal point found")
-
-print()
-print("Testing point source...")
-rays_point = tracer.trace_point_source_rays(
-    source_x=-100,
-    source_y=0,
-    num_rays=7,
-    max_angle=15.0
-)
-
-print(f"✓ Traced {len(rays_point)} rays from point source")
-print()
-
-# Test lens outline
-outline = tracer.get_lens_outline(num_points=50)
-print(f"✓ Generated lens outline with {len(outline)} points")
-print()
-
-print("="*60)
-print("✓ Ray tracer working correctly!")
+    Traced in double precision with trace_parallel_rays_soa so the result
+    does not depend on float32 rounding.
+    """
+    snapshot = {}
+    for i, config in enumerate(LENS_CONFIGS):
+        tracer = LensRayTracer(make_lens(*config), dtype=np.float64)
+        result = tracer.trace_parallel_rays_soa(num_rays=11, angle_deg=2.0)
+        for field, values in zip(SNAPSHOT_FIELDS, result):
+            snapshot[f"{i}_{field}"] = values
+    return snapshot
+
+
+def write_golden(path=GOLDEN_PATH):
+    """Regenerate the golden snapshot after an intended change in tracing"""
+    np.savez_compressed(path, **trace_snapshot())
+
+
+class TestRayTracerQuick(unittest.TestCase):
+    """Fast smoke checks of the ray tracer over the standard test lenses"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tracers = [(config, LensRayTracer(make_lens(*config))) for config in LENS_CONFIGS]
+
+    def test_parallel_rays(self):
+        """Test tracing a collimated beam"""
+        for config, tracer in self.tracers:
+            with self.subTest(lens=config[0]):
+                rays = tracer.trace_parallel_rays(num_rays=10)
+                self.assertEqual(len(rays), 10)
+                for ray in rays:
+                    self.assertGreater(len(ray.path), 1)
+
+    def test_focal_point(self):
+        """Test that the biconvex lens focuses a collimated beam behind the lens"""
+        _, tracer = self.tracers[0]
+        focal_point = tracer.find_focal_point(tracer.trace_parallel_rays(num_rays=10))
+        self.assertIsNotNone(focal_point)
+
+        fx, fy = focal_point
+        bfd = fx - tracer.back_vertex_x
+        theoretical_f = tracer.lens.calculate_focal_length()
+        self.assertEqual(fy, 0)
+        self.assertGreater(bfd, 0)
+        # Within 10% of the thin-lens value despite spherical aberration
+        self.assertLess(abs(bfd - theoretical_f) / theoretical_f, 0.1)
+
+    def test_point_source(self):
+        """Test tracing a fan of rays from a point source"""
+        for config, tracer in self.tracers:
+            with self.subTest(lens=config[0]):
+                rays = tracer.trace_point_source_rays(
+                    source_x=-100,
+                    source_y=0,
+                    num_rays=7,
+                    max_angle_deg=15.0
+                )
+                self.assertEqual(len(rays), 7)
+
+    def test_lens_outline(self):
+        """Test generating the lens outline"""
+        for config, tracer in self.tracers:
+            with self.subTest(lens=config[0]):
+                outline = tracer.get_lens_outline(num_points=50)
+                self.assertEqual(len(outline), 100)
+
+    def test_matches_golden_snapshot(self):
+        """Test that beam traces match the frozen reference (see write_golden)"""
+        current = trace_snapshot()
+        with np.load(GOLDEN_PATH) as golden:
+            self.assertEqual(sorted(golden.files), sorted(current))
+            for key, values in current.items():
+                with self.subTest(key=key):
+                    np.testing.assert_allclose(values, golden[key], rtol=0, atol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -24,154 +24,74 @@ from validation import (
     safe_float_conversion,
     validate_lens_parameters,
     check_physical_feasibility,
+    validate_lens_data_schema,
+    validate_lenses_json_schema,
 )
 
 
+# (validator, args, kwargs, expected result) for values that must pass
+VALID_CASES = [
+    (validate_radius, (100.0,), {}, 100.0),
+    (validate_radius, (50.0,), {'allow_negative': False}, 50.0),
+    (validate_radius, (-100.0,), {'allow_negative': True}, -100.0),
+    (validate_thickness, (5.0,), {}, 5.0),
+    (validate_diameter, (50.0,), {}, 50.0),
+    (validate_refractive_index, (1.5168,), {}, 1.5168),
+    (validate_refractive_index, (1.0,), {}, 1.0),  # Air
+    (validate_wavelength, (587.6,), {}, 587.6),
+    (validate_temperature, (20.0,), {}, 20.0),
+    (validate_temperature, (0.0,), {}, 0.0),  # Freezing point
+    (validate_positive_number, (10.0,), {}, 10.0),
+    (validate_non_negative_number, (10.0,), {}, 10.0),
+    (validate_non_negative_number, (0.0,), {}, 0.0),
+    (validate_range, (5.0, 0.0, 10.0), {}, 5.0),
+    (validate_range, (0.0, 0.0, 10.0), {}, 0.0),  # Min boundary
+    (validate_range, (10.0, 0.0, 10.0), {}, 10.0),  # Max boundary
+    (validate_lens_name, ("My Lens",), {}, "My Lens"),
+    (validate_lens_name, ("",), {}, "Untitled"),  # Empty becomes "Untitled"
+    (validate_lens_name, ("  ",), {}, "Untitled"),  # Whitespace becomes "Untitled"
+]
+
+# (validator, args, kwargs) for values that must raise ValidationError
+INVALID_CASES = [
+    (validate_radius, (-100.0,), {'allow_negative': False}),
+    (validate_radius, (0.0,), {}),
+    (validate_radius, (0.5,), {}),  # Too small
+    (validate_radius, (50000.0,), {}),  # Too large
+    (validate_thickness, (0.0,), {}),  # Must be positive
+    (validate_thickness, (-5.0,), {}),  # Must be positive
+    (validate_diameter, (0.0,), {}),
+    (validate_diameter, (-10.0,), {}),
+    (validate_refractive_index, (0.5,), {}),  # Too low
+    (validate_refractive_index, (5.0,), {}),  # Too high
+    (validate_wavelength, (0.0,), {}),
+    (validate_wavelength, (50.0,), {}),  # Below visible range
+    (validate_wavelength, (5000.0,), {}),  # Above IR range
+    (validate_temperature, (-300.0,), {}),  # Below absolute zero
+    (validate_positive_number, (0.0,), {}),
+    (validate_positive_number, (-5.0,), {}),
+    (validate_non_negative_number, (-1.0,), {}),
+    (validate_range, (-1.0, 0.0, 10.0), {}),
+    (validate_range, (11.0, 0.0, 10.0), {}),
+    (validate_lens_name, ("a" * 200,), {}),  # Too long
+]
+
+
 class TestValidationFunctions(unittest.TestCase):
     """Test validation functions"""
     
-    def test_validate_radius_positive(self):
-        """Test radius validation with positive values"""
-        result = validate_radius(100.0)
-        self.assertEqual(result, 100.0)
-        
-        result = validate_radius(50.0, allow_negative=False)
-        self.assertEqual(result, 50.0)
-    
-    def test_validate_radius_negative(self):
-        """Test radius validation with negative values"""
-        result = validate_radius(-100.0, allow_negative=True)
-        self.assertEqual(result, -100.0)
-        
-        with self.assertRaises(ValidationError):
-            validate_radius(-100.0, allow_negative=False)
-    
-    def test_validate_radius_zero(self):
-        """Test radius validation rejects zero"""
-        with self.assertRaises(ValidationError):
-            validate_radius(0.0)
-    
-    def test_validate_radius_out_of_range(self):
-        """Test radius validation enforces ranges"""
-        with self.assertRaises(ValidationError):
-            validate_radius(0.5)  # Too small
-        
-        with self.assertRaises(ValidationError):
-            validate_radius(50000.0)  # Too large
-    
-    def test_validate_thickness(self):
-        """Test thickness validation"""
-        result = validate_thickness(5.0)
-        self.assertEqual(result, 5.0)
-        
-        with self.assertRaises(ValidationError):
-            validate_thickness(0.0)  # Must be positive
-        
-        with self.assertRaises(ValidationError):
-            validate_thickness(-5.0)  # Must be positive
-    
-    def test_validate_diameter(self):
-        """Test diameter validation"""
-        result = validate_diameter(50.0)
-        self.assertEqual(result, 50.0)
-        
-        with self.assertRaises(ValidationError):
-            validate_diameter(0.0)
-        
-        with self.assertRaises(ValidationError):
-            validate_diameter(-10.0)
-    
-    def test_validate_refractive_index(self):
-        """Test refractive index validation"""
-        result = validate_refractive_index(1.5168)
-        self.assertEqual(result, 1.5168)
-        
-        result = validate_refractive_index(1.0)  # Air
-        self.assertEqual(result, 1.0)
-        
-        with self.assertRaises(ValidationError):
-            validate_refractive_index(0.5)  # Too low
-        
-        with self.assertRaises(ValidationError):
-            validate_refractive_index(5.0)  # Too high
-    
-    def test_validate_wavelength(self):
-        """Test wavelength validation"""
-        result = validate_wavelength(587.6)
-        self.assertEqual(result, 587.6)
-        
-        with self.assertRaises(ValidationError):
-            validate_wavelength(0.0)
-        
-        with self.assertRaises(ValidationError):
-            validate_wavelength(50.0)  # Below visible range
-        
-        with self.assertRaises(ValidationError):
-            validate_wavelength(5000.0)  # Above IR range
-    
-    def test_validate_temperature(self):
-        """Test temperature validation"""
-        result = validate_temperature(20.0)
-        self.assertEqual(result, 20.0)
-        
-        result = validate_temperature(0.0)  # Freezing point
-        self.assertEqual(result, 0.0)
-        
-        with self.assertRaises(ValidationError):
-            validate_temperature(-300.0)  # Below absolute zero
-    
-    def test_validate_positive_number(self):
-        """Test positive number validation"""
-        result = validate_positive_number(10.0)
-        self.assertEqual(result, 10.0)
-        
-        with self.assertRaises(ValidationError):
-            validate_positive_number(0.0)
-        
-        with self.assertRaises(ValidationError):
-            validate_positive_number(-5.0)
+    def test_valid_values(self):
+        """Test that validators return accepted values (normalized)"""
+        for validator, args, kwargs, expected in VALID_CASES:
+            with self.subTest(validator=validator.__name__, args=args, kwargs=kwargs):
+                self.assertEqual(validator(*args, **kwargs), expected)
     
-    def test_validate_non_negative_number(self):
-        """Test non-negative number validation"""
-        result = validate_non_negative_number(10.0)
-        self.assertEqual(result, 10.0)
-        
-        result = validate_non_negative_number(0.0)
-        self.assertEqual(result, 0.0)
-        
-        with self.assertRaises(ValidationError):
-            validate_non_negative_number(-1.0)
-    
-    def test_validate_range(self):
-        """Test range validation"""
-        result = validate_range(5.0, 0.0, 10.0)
-        self.assertEqual(result, 5.0)
-        
-        result = validate_range(0.0, 0.0, 10.0)  # Min boundary
-        self.assertEqual(result, 0.0)
-        
-        result = validate_range(10.0, 0.0, 10.0)  # Max boundary
-        self.assertEqual(result, 10.0)
-        
-        with self.assertRaises(ValidationError):
-            validate_range(-1.0, 0.0, 10.0)
-        
-        with self.assertRaises(ValidationError):
-            validate_range(11.0, 0.0, 10.0)
-    
-    def test_validate_lens_name(self):
-        """Test lens name validation"""
-        result = validate_lens_name("My Lens")
-        self.assertEqual(result, "My Lens")
-        
-        result = validate_lens_name("")  # Empty becomes "Untitled"
-        self.assertEqual(result, "Untitled")
-        
-        result = validate_lens_name("  ")  # Whitespace becomes "Untitled"
-        self.assertEqual(result, "Untitled")
-        
-        with self.assertRaises(ValidationError):
-            validate_lens_name("a" * 200)  # Too long
+    def test_invalid_values(self):
+        """Test that validators reject values out of range or of the wrong sign"""
+        for validator, args, kwargs in INVALID_CASES:
+            with self.subTest(validator=validator.__name__, args=args, kwargs=kwargs):
+                with self.assertRaises(ValidationError):
+                    validator(*args, **kwargs)
 
 
 class TestSafeConversion(unittest.TestCase):
@@ -299,7 +219,6 @@ class TestSchemaValidation(unittest.TestCase):
     
     def test_validate_lens_data_schema_valid(self):
         """Test that valid lens data passes validation"""
-        from validation import validate_lens_data_schema
         valid_data = {
             'name': 'Test Lens',
             'radius_of_curvature_1': 100.0,
@@ -315,7 +234,6 @@ class TestSchemaValidation(unittest.TestCase):
     
     def test_validate_lens_data_schema_missing_field(self):
         """Test detection of missing required fields"""
-        from validation import validate_lens_data_schema
         invalid_data = {
             'name': 'Test Lens',
             # Missing radius_of_curvature_1
@@ -329,7 +247,6 @@ class TestSchemaValidation(unittest.TestCase):
             
     def test_validate_lens_data_schema_wrong_type(self):
         """Test detection of wrong value types"""
-        from validation import validate_lens_data_schema
         invalid_data = {
             'name': 'Test Lens',
             'radius_of_curvature_1': "not a number",
@@ -343,7 +260,6 @@ class TestSchemaValidation(unittest.TestCase):
 
     def test_validate_lenses_json_schema_valid(self):
         """Test validation of lenses array"""
-        from validation import validate_lenses_json_schema
         valid_array = [
             {
                 'name': 'Lens 1',
@@ -367,7 +283,6 @@ class TestSchemaValidation(unittest.TestCase):
 
     def test_validate_lenses_json_schema_not_array(self):
         """Test rejection of non-array root"""
-        from validation import validate_lenses_json_schema
         with self.assertRaises(ValidationError):
             validate_lenses_json_schema({'not': 'an array'})
 
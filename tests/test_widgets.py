@@ -5,6 +5,7 @@ Tests for PySide6 Widgets and Lens Rendering
 import unittest
 import sys
 import os
+from unittest import mock
 
 # Add parent to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -13,45 +14,25 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 class TestLensClassification(unittest.TestCase):
     """Test lens type classification"""
     
-    def setUp(self):
-        from src.lens import Lens
-        self.lens = Lens()
-    
-    def test_biconvex_classification(self):
-        """Biconvex lens should have R1 > 0, R2 < 0"""
-        self.lens.radius_of_curvature_1 = 100
-        self.lens.radius_of_curvature_2 = -100
-        self.assertEqual(self.lens.classify_lens_type(), "Biconvex")
-    
-    def test_biconcave_classification(self):
-        """Biconcave lens should have R1 < 0, R2 > 0"""
-        self.lens.radius_of_curvature_1 = -100
-        self.lens.radius_of_curvature_2 = 100
-        self.assertEqual(self.lens.classify_lens_type(), "Biconcave")
-    
-    def test_plano_convex_classification(self):
-        """Plano-convex lens should have one radius = 0"""
-        self.lens.radius_of_curvature_1 = 100
-        self.lens.radius_of_curvature_2 = 0
-        self.assertIn("Plano-Convex", self.lens.classify_lens_type())
+    # (R1, R2, expected type); a radius of 0 is a flat surface
+    CASES = [
+        (100, -100, "Biconvex"),
+        (-100, 100, "Biconcave"),
+        (100, 0, "Plano-Convex"),
+        (-100, 0, "Plano-Concave"),
+        (50, 100, "Meniscus Convex"),      # R1 < R2, both positive
+        (100, 50, "Meniscus Concave"),     # R1 > R2, both positive
+    ]
     
-    def test_plano_concave_classification(self):
-        """Plano-concave lens should have one radius = 0"""
-        self.lens.radius_of_curvature_1 = -100
-        self.lens.radius_of_curvature_2 = 0
-        self.assertIn("Plano-Concave", self.lens.classify_lens_type())
-
-    def test_meniscus_convex_classification(self):
-        """Meniscus convex lens should have R1 > 0, R2 > 0 and R1 < R2"""
-        self.lens.radius_of_curvature_1 = 50
-        self.lens.radius_of_curvature_2 = 100
-        self.assertEqual(self.lens.classify_lens_type(), "Meniscus Convex")
-
-    def test_meniscus_concave_classification(self):
-        """Meniscus concave lens should have R1 > 0, R2 > 0 and R1 > R2"""
-        self.lens.radius_of_curvature_1 = 100
-        self.lens.radius_of_curvature_2 = 50
-        self.assertEqual(self.lens.classify_lens_type(), "Meniscus Concave")
+    def test_classification(self):
+        """Each radius sign combination maps to its lens type"""
+        from src.lens import Lens
+        lens = Lens()
+        for r1, r2, expected in self.CASES:
+            with self.subTest(r1=r1, r2=r2):
+                lens.radius_of_curvature_1 = r1
+                lens.radius_of_curvature_2 = r2
+                self.assertEqual(lens.classify_lens_type(), expected)
 
 
 class TestLensCalculation(unittest.TestCase):
@@ -123,6 +104,108 @@ class Test3DRendering(unittest.TestCase):
         self.assertLess(z_edge, 0)
 
 
+class TestLensViz3D(unittest.TestCase):
+    """Test the 3D lens view through its matplotlib artists"""
+    
+    @classmethod
+    def setUpClass(cls):
+        try:
+            from PySide6.QtWidgets import QApplication
+            import matplotlib  # noqa: F401
+        except ImportError:
+            raise unittest.SkipTest("PySide6 and matplotlib required for the 3D view")
+        from src.gui.widgets.lens_viz_3d import _3DVisualizationWidget
+        
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+        cls.viz = _3DVisualizationWidget()
+    
+    def _update_without_render(self, lens):
+        """Build the lens artists, skipping the canvas render"""
+        with mock.patch.object(self.viz._canvas, 'draw_idle'):
+            self.viz.update_lens(lens)
+        return self.viz._ax_lens
+    
+    def test_lens_shapes(self):
+        """Every lens shape gets finite edge geometry and a surface per curved side"""
+        import numpy as np
+        from src.lens import Lens
+        
+        # (name, R1, R2, curved surfaces)
+        cases = [
+            ("Biconvex", 100, -100, 2),
+            ("Plano-Convex", 100, 0, 1),
+            ("Biconcave", -100, 100, 2),
+            ("Meniscus", 50, 100, 2),
+        ]
+        for name, r1, r2, surfaces in cases:
+            with self.subTest(lens=name):
+                lens = Lens()
+                lens.radius_of_curvature_1 = r1
+                lens.radius_of_curvature_2 = r2
+                ax = self._update_without_render(lens)
+                
+                self.assertEqual(len(ax.collections), surfaces)
+                # Two edge circles plus the cylinder wall
+                self.assertGreater(len(ax.lines), 2)
+                for line in ax.lines:
+                    self.assertTrue(np.all(np.isfinite(line.get_data_3d())))
+    
+    def test_update_lens_renders(self):
+        """Updates render end to end, once per event loop pass"""
+        from src.lens import Lens
+        canvas = self.viz._canvas
+        with mock.patch.object(canvas, 'draw', wraps=canvas.draw) as draw:
+            self.viz.update_lens(Lens())
+            self.viz.update_lens(Lens())
+            self.app.processEvents()
+        draw.assert_called_once_with()
+        self.assertEqual(len(self.viz._ax_lens.texts), 1)
+    
+    def test_update_lens_reuses_axes(self):
+        """Updates redraw into the existing axes instead of recreating them"""
+        from src.lens import Lens
+        axes = list(self.viz._figure.axes)
+        self._update_without_render(Lens())
+        self._update_without_render(Lens())
+        self.assertEqual(self.viz._figure.axes, axes)
+
+
+class TestLensVisualizationWidget(unittest.TestCase):
+    """Test the 2D/3D tab container"""
+    
+    @classmethod
+    def setUpClass(cls):
+        try:
+            from PySide6.QtWidgets import QApplication
+            import matplotlib  # noqa: F401
+        except ImportError:
+            raise unittest.SkipTest("PySide6 and matplotlib required for the lens view")
+        
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+    
+    def test_hidden_3d_view_updates_when_shown(self):
+        """The 3D view is only rebuilt once its tab is shown"""
+        from src.gui.widgets.lens_viz_container import LensVisualizationWidget
+        from src.lens import Lens
+        
+        viz = LensVisualizationWidget()
+        lens = Lens()
+        with mock.patch.object(viz._3d_widget, 'update_lens') as update_3d:
+            viz.update_lens(lens)
+            viz.update_lens(lens)
+            update_3d.assert_not_called()
+            
+            viz.set_view_mode("3D")
+            update_3d.assert_called_once_with(lens)
+            
+            viz.update_lens(lens)
+            self.assertEqual(update_3d.call_count, 2)
+            
+            viz.set_view_mode("2D")
+            viz.set_view_mode("3D")
+            self.assertEqual(update_3d.call_count, 2)
+
+
 def run_tests():
     """Run widget tests"""
     loader = unittest.TestLoader()
@@ -131,6 +214,8 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestLensClassification))
     suite.addTests(loader.loadTestsFromTestCase(TestLensCalculation))
     suite.addTests(loader.loadTestsFromTestCase(Test3DRendering))
+    suite.addTests(loader.loadTestsFromTestCase(TestLensViz3D))
+    suite.addTests(loader.loadTestsFromTestCase(TestLensVisualizationWidget))
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)